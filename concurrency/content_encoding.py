@@ -0,0 +1,161 @@
+"""
+HTTP content-encoding helpers shared by the IO examples.
+
+    * accept_encoding() advertises every codec available in this interpreter.
+    * Decoder decompresses a response body chunk by chunk, so the streaming
+      read path never has to buffer the whole compressed payload.
+    * gzip and deflate come from zlib (always available), brotli and zstd are
+      used only when their packages are installed:
+
+        uv run --with brotli --with zstandard 02_intensive_io.py
+"""
+
+from dataclasses import dataclass
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024
+
+
+def available_encodings():
+    """Encodings we are able to decode, in order of preference."""
+    encodings = []
+    if zstd is not None or zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings += ["gzip", "deflate"]
+    return encodings
+
+
+def accept_encoding():
+    return ", ".join(available_encodings())
+
+
+class _Identity:
+    def decompress(self, chunk):
+        return chunk
+
+    def flush(self):
+        return b""
+
+
+class _Zlib:
+    """gzip or deflate. "deflate" should be zlib-wrapped, but some servers send raw deflate."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.first_chunk = True
+        # 16 + MAX_WBITS expects a gzip header, MAX_WBITS a zlib header
+        wbits = 16 + zlib.MAX_WBITS if encoding == "gzip" else zlib.MAX_WBITS
+        self.decompressor = zlib.decompressobj(wbits)
+
+    def decompress(self, chunk):
+        if self.first_chunk and self.encoding == "deflate":
+            self.first_chunk = False
+            try:
+                return self.decompressor.decompress(chunk)
+            except zlib.error:
+                self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self.decompressor.decompress(chunk)
+
+    def flush(self):
+        return self.decompressor.flush()
+
+
+class _Brotli:
+    def __init__(self):
+        self.decompressor = brotli.Decompressor()
+
+    def decompress(self, chunk):
+        return self.decompressor.process(chunk)
+
+    def flush(self):
+        return b""
+
+
+class _Zstd:
+    def __init__(self):
+        if zstd is not None:
+            self.decompressor = zstd.ZstdDecompressor()
+        else:
+            self.decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, chunk):
+        return self.decompressor.decompress(chunk)
+
+    def flush(self):
+        return b""
+
+
+def _codec(encoding):
+    if encoding in ("", "identity"):
+        return _Identity()
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        return _Zlib("gzip" if encoding == "x-gzip" else encoding)
+    if encoding == "br" and brotli is not None:
+        return _Brotli()
+    if encoding == "zstd" and (zstd is not None or zstandard is not None):
+        return _Zstd()
+    raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+
+class Decoder:
+    """Incremental decoder for a Content-Encoding header value.
+
+    Encodings are listed in the order they were applied, so they are undone
+    in reverse order, e.g. "gzip, br" means brotli first, then gzip.
+    """
+
+    def __init__(self, content_encoding=None):
+        encodings = [e.strip().lower() for e in (content_encoding or "").split(",")]
+        self.codecs = [_codec(e) for e in reversed(encodings) if e]
+        self.wire_bytes = 0
+
+    def decompress(self, chunk):
+        self.wire_bytes += len(chunk)
+        for codec in self.codecs:
+            chunk = codec.decompress(chunk)
+        return chunk
+
+    def flush(self):
+        data = b""
+        for codec in self.codecs:
+            data = (codec.decompress(data) if data else b"") + codec.flush()
+        return data
+
+
+@dataclass
+class Download:
+    """What came over the wire versus what we decoded from it."""
+
+    wire_bytes: int
+    content: bytes
+
+    @property
+    def decoded_bytes(self):
+        return len(self.content)
+
+
+def print_report(strategy, elapsed, downloads):
+    wire = sum(d.wire_bytes for d in downloads)
+    decoded = sum(d.decoded_bytes for d in downloads)
+    ratio = decoded / wire if wire else 0
+    print(f"\n{strategy} spent: {elapsed:.2f}")
+    print(f"\twire: {wire / 1024:.0f} KiB, decoded: {decoded / 1024:.0f} KiB, ratio: {ratio:.1f}x\n")
@@ -0,0 +1,141 @@
+"""
+Local HTTP server to measure compressed transfers offline.
+
+    * /page/<n>      negotiates Content-Encoding from the Accept-Encoding header.
+    * /identity/<n>  always answers uncompressed, whatever the client accepts.
+    * Pages are generated HTML (~256 KiB each) and every encoded variant is
+      computed once and kept in memory, so the server does not skew timings.
+    * rate (bytes per second, per connection) simulates a bandwidth-limited link.
+
+Run it standalone with `uv run local_server.py` or let 02_intensive_io.py
+start it with `uv run 02_intensive_io.py --local`.
+"""
+
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import Random
+from threading import Thread
+from time import monotonic, sleep
+import gzip
+import zlib
+
+from content_encoding import CHUNK_SIZE, available_encodings, brotli, zstandard, zstd
+
+PAGES = 40
+PAGE_SIZE = 256 * 1024
+WORDS = (
+    "concurrency parallelism process thread asyncio executor future event loop "
+    "socket select coroutine task queue lock semaphore barrier pool worker "
+    "<div> </div> <p> </p> <a href=\"/\"> </a> <span class=\"title\"> </span>"
+).split()
+
+
+@lru_cache(maxsize=None)
+def page(number):
+    rnd = Random(number)
+    words = []
+    size = 0
+    while size < PAGE_SIZE:
+        word = rnd.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    body = " ".join(words)
+    return f"<html><head><title>Page {number}</title></head><body>{body}</body></html>".encode()
+
+
+@lru_cache(maxsize=None)
+def encoded_page(number, encoding):
+    content = page(number)
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=6)
+    if encoding == "deflate":
+        return zlib.compress(content, 6)
+    if encoding == "br":
+        return brotli.compress(content, quality=5)
+    if encoding == "zstd":
+        if zstd is not None:
+            return zstd.compress(content)
+        return zstandard.ZstdCompressor().compress(content)
+    return content
+
+
+def negotiate(accept_encoding):
+    """Pick the server's preferred encoding among the ones accepted (q > 0)."""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        try:
+            quality = float(q) if q else 1.0
+        except ValueError:  # a malformed q-value makes the entry unacceptable, like HTTP servers treat it
+            quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.strip().lower())
+    for encoding in available_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return "identity"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    rate = None
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] not in ("page", "identity") or not parts[1].isdigit():
+            self.send_error(404)
+            return
+        number = int(parts[1])
+        encoding = negotiate(self.headers.get("Accept-Encoding")) if parts[0] == "page" else "identity"
+        body = encoded_page(number, encoding)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.send_body(body)
+
+    def send_body(self, body):
+        start = monotonic()
+        for offset in range(0, len(body), CHUNK_SIZE):
+            self.wfile.write(body[offset:offset + CHUNK_SIZE])
+            if self.rate:
+                # sleep until the bytes sent so far fit the bandwidth budget
+                ahead = (offset + CHUNK_SIZE) / self.rate - (monotonic() - start)
+                if ahead > 0:
+                    sleep(ahead)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(port=0, rate=None):
+    handler = type("RateLimitedHandler", (Handler,), {"rate": rate})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_server(port=0, rate=None):
+    """Start the server in a daemon thread, returns it so the caller can read server_port."""
+    server = make_server(port, rate)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def local_urls(server, variant="page"):
+    return [f"http://127.0.0.1:{server.server_port}/{variant}/{n}" for n in range(PAGES)]
+
+
+if __name__ == "__main__":
+    server = make_server(port=8000)
+    print(f"Serving {PAGES} pages on http://127.0.0.1:8000/page/<n> and /identity/<n>")
+    print(f"Available encodings: {', '.join(available_encodings())}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
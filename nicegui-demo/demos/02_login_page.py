@@ -4,19 +4,21 @@ Please see the `OAuth2 example at FastAPI <https://fastapi.tiangolo.com/tutorial
 use the great `Authlib package <https://docs.authlib.org/en/v0.13/client/starlette.html#using-fastapi>`_ to implement a classing real authentication system.
 Here we just demonstrate the NiceGUI integration.
 """
-from typing import Optional
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
 from time import sleep
-from multiprocessing import Manager, Queue
 
-from fastapi import Request
 from fastapi.responses import RedirectResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from nicegui import app, run, ui
+from nicegui import app, ui
 from nicegui import events
 
-import pandas as pd
-from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from annotation_layer import AnnotationLayer
+from lazy_tabs import LazyTabPanels
+from progress import ProgressChannel
 
 # in reality users passwords would obviously need to be hashed
 passwords = {'user1': 'pass1', 'admin': 'admin'}
@@ -24,38 +26,74 @@ passwords = {'user1': 'pass1', 'admin': 'admin'}
 unrestricted_page_routes = {'/login'}
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthMiddleware:
     """This middleware restricts access to all NiceGUI pages.
     It redirects the user to the login page if they are not authenticated.
+
+    It is a plain ASGI middleware: no extra task and response stream per request like with ``BaseHTTPMiddleware``.
+    Static files and unrestricted pages pass before the session is looked at,
+    and authenticated sessions are remembered in memory until they log out, for at most `SESSION_TTL` seconds.
+    After that the user storage is checked again, so abandoned sessions do not stay trusted,
+    and only the `MAX_SESSIONS` most recently checked sessions are kept.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        if not app.storage.user.get('authenticated', False):
-            if not request.url.path.startswith('/_nicegui') and request.url.path not in unrestricted_page_routes:
-                app.storage.user['referrer_path'] = request.url.path  # remember where the user wanted to go
-                return RedirectResponse('/login')
-        return await call_next(request)
+    SESSION_TTL = 300.0
+    MAX_SESSIONS = 10_000
+    authenticated_sessions: OrderedDict[str, float] = OrderedDict()  # session id -> expiry, oldest first
+
+    @classmethod
+    def remember(cls, session_id: str) -> None:
+        cls.authenticated_sessions[session_id] = time.monotonic() + cls.SESSION_TTL
+        cls.authenticated_sessions.move_to_end(session_id)
+        if len(cls.authenticated_sessions) > cls.MAX_SESSIONS:
+            cls.authenticated_sessions.popitem(last=False)
+
+    @classmethod
+    def forget(cls, session_id: str) -> None:
+        cls.authenticated_sessions.pop(session_id, None)
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get('path', '')
+        if scope['type'] != 'http' or path.startswith('/_nicegui') or path in unrestricted_page_routes:
+            await self.app(scope, receive, send)
+            return
+        session_id = scope['session'].get('id')
+        if self.authenticated_sessions.get(session_id, 0.0) < time.monotonic():
+            self.forget(session_id)
+            if not app.storage.user.get('authenticated', False):
+                app.storage.user['referrer_path'] = path  # remember where the user wanted to go
+                await RedirectResponse('/login')(scope, receive, send)
+                return
+            self.remember(session_id)  # e.g. logged in before a restart or longer than the TTL ago
+        await self.app(scope, receive, send)
 
 class Demo:
     def __init__(self):
         self.number = 1
 
-def heavy_computation(q: Queue) -> str:
-    """Run some heavy computation that updates the progress bar through the queue."""
+def heavy_computation(progress: Callable[[float], None]) -> str:
+    """Run some heavy computation that updates the progress bar through the progress channel."""
     n = 50
     for i in range(n):
         # Perform some heavy computation
         sleep(0.05)
 
-        # Update the progress bar through the queue
-        q.put_nowait(i / n)
+        # Update the progress bar of the client that started the computation
+        progress(i / n)
     return 'Done!'
 
+# one channel for all clients; it replaces a Manager process and a polling timer per page
+progress_channel = ProgressChannel()
+
 app.add_middleware(AuthMiddleware)
 
 @ui.page('/')
 def main_page() -> None:
     def logout() -> None:
+        AuthMiddleware.forget(app.storage.browser['id'])
         app.storage.user.clear()
         ui.navigate.to('/login')
 
@@ -82,176 +120,179 @@ def test_page() -> None:
         ui.button('Dark', on_click=dark.enable)
         ui.button('Light', on_click=dark.disable)
 
-    with ui.tab_panels(tabs, value='Components').classes('w-full'):
-        with ui.tab_panel('Widgets'):
-            ui.label('Content of Widgets')
-            
-            async def start_computation():
-                progressbar.visible = True
-                result = await run.cpu_bound(heavy_computation, queue)
-                ui.notify(result)
-                progressbar.visible = False
-
-            # Create a queue to communicate with the heavy computation process
-            queue = Manager().Queue()
-            # Update the progress bar on the main process
-            ui.timer(0.1, callback=lambda: progressbar.set_value(queue.get() if not queue.empty() else progressbar.value))
-
-            # Create the UI
-            ui.button('compute', on_click=start_computation)
-            progressbar = ui.linear_progress(value=0).props('instant-feedback')
-            progressbar.visible = False
-
-            ui.separator()
-            ui.date(value='2025-02-25', on_change=lambda e: result.set_text(e.value))
-            result = ui.label()
-
-            ui.separator()
-            ui.upload(on_upload=lambda e: ui.notify(f'Uploaded {e.name}')).classes('max-w-full')
-
-            def mouse_handler(e: events.MouseEventArguments):
-                color = 'SkyBlue' if e.type == 'mousedown' else 'SteelBlue'
-                ii.content += f'<circle cx="{e.image_x}" cy="{e.image_y}" r="15" fill="none" stroke="{color}" stroke-width="4" />'
-                ui.notify(f'{e.type} at ({e.image_x:.1f}, {e.image_y:.1f})')
-
-            ui.separator()
-            src = 'https://picsum.photos/id/565/640/360'
-            ii = ui.interactive_image(src, on_mouse=mouse_handler, events=['mousedown', 'mouseup'], cross=True)
-
-            ui.separator()
-            with ui.carousel(animated=True, arrows=True, navigation=True).props('height=180px'):
-                with ui.carousel_slide().classes('p-0'):
-                    ui.image('https://picsum.photos/id/30/270/180').classes('w-[270px]')
-                with ui.carousel_slide().classes('p-0'):
-                    ui.image('https://picsum.photos/id/31/270/180').classes('w-[270px]')
-                with ui.carousel_slide().classes('p-0'):
-                    ui.image('https://picsum.photos/id/32/270/180').classes('w-[270px]')
-
-        with ui.tab_panel('Dataframe'):
-            ui.label('Content of Dataframe')
-            df = pd.DataFrame(data={
-                'col1': [x for x in range(4)],
-                'col2': ['This', 'column', 'contains', 'strings.'],
-                'col3': [x / 4 for x in range(4)],
-                'col4': [True, False, True, False],
-            })
-
-
-            def update(*, df: pd.DataFrame, r: int, c: int, value):
-                df.iat[r, c] = value
-                ui.notify(f'Set ({r}, {c}) to {value}')
-
-
-            with ui.grid(rows=len(df.index)+1).classes('grid-flow-col'):
-                for c, col in enumerate(df.columns):
-                    ui.label(col).classes('font-bold')
-                    for r, row in enumerate(df.loc[:, col]):
-                        if is_bool_dtype(df[col].dtype):
-                            cls = ui.checkbox
-                        elif is_numeric_dtype(df[col].dtype):
-                            cls = ui.number
-                        else:
-                            cls = ui.input
-                        cls(value=row, on_change=lambda event, r=r, c=c: update(df=df, r=r, c=c, value=event.value))
-
-            ui.separator()
-            from random import random
-
-            echart = ui.echart({
-                'xAxis': {'type': 'value'},
-                'yAxis': {'type': 'category', 'data': ['A', 'B'], 'inverse': True},
-                'legend': {'textStyle': {'color': 'gray'}},
-                'series': [
-                    {'type': 'bar', 'name': 'Alpha', 'data': [0.1, 0.2]},
-                    {'type': 'bar', 'name': 'Beta', 'data': [0.3, 0.4]},
-                ],
-            })
-
-            def update():
-                echart.options['series'][0]['data'][0] = random()
-                echart.update()
-
-            ui.button('Update', on_click=update)
-
-        with ui.tab_panel('Components'):
-            ui.label('Content of Components')
-            def show(event: events.ValueChangeEventArguments):
-                name = type(event.sender).__name__
-                ui.notify(f'{name}: {event.value}')
-
-            with ui.row():
-                ui.button('Button 1', on_click=lambda: ui.notify('Click'))
-                ui.button('Button 2', on_click=lambda: ui.notify('Click'))
-
-            with ui.row():
-                ui.button(icon='add', on_click=lambda: ui.notify('Click'))
-                ui.button(icon='add', on_click=lambda: ui.notify('Click')).props('outline')
-                ui.button(icon='add', on_click=lambda: ui.notify('Click')).props('flat')
-
-            with ui.row():
-                ui.checkbox('Checkbox', on_change=show)
-                ui.checkbox('Checkbox', on_change=show).props('checked')
-                ui.checkbox('Checkbox', on_change=show)
-                ui.separator()
-                ui.switch('Switch', on_change=show)
-                ui.switch('Switch', on_change=show).props('checked')
-                ui.switch('Switch', on_change=show).props('checked')
-
-            ui.radio(['A', 'B', 'C'], value='A', on_change=show).props('inline')
-
-            with ui.row():
-                ui.input('Text input', on_change=show)
-                ui.select(['One', 'Two'], value='One', on_change=show)
-            
-            ui.separator()
-            ui.label('Value Binding')
-            demo = Demo()
-            v = ui.checkbox('visible', value=True)
-            with ui.column().bind_visibility_from(v, 'value'):
-                ui.slider(min=1, max=3).bind_value(demo, 'number')
-                ui.toggle({1: 'A', 2: 'B', 3: 'C'}).bind_value(demo, 'number')
-                ui.number().bind_value(demo, 'number')
-
-            ui.separator()
-            ui.chat_message(['Hello NiceGUI!', 'I am a robot.'],
-                name='Robot',
-                stamp='now',
-                avatar='https://robohash.org/ui')
+    # the panels are only built when their tab is opened for the first time
+    def widgets() -> None:
+        ui.label('Content of Widgets')
 
-            ui.separator()
-            with ui.button(icon='colorize') as button:
-                ui.color_picker(on_pick=lambda e: button.classes(f'!bg-[{e.color}]'))
-
-            ui.separator()
-            def alert():
-                ui.run_javascript('alert("Hello!")')
-            ui.button('fire and forget', on_click=alert)
+        async def start_computation():
+            progressbar.visible = True
+            result = await progress_channel.run(heavy_computation, on_progress=progressbar.set_value)
+            ui.notify(result)
+            progressbar.visible = False
 
+        # Create the UI
+        ui.button('compute', on_click=start_computation)
+        progressbar = ui.linear_progress(value=0).props('instant-feedback')
+        progressbar.visible = False
+
+        ui.separator()
+        ui.date(value='2025-02-25', on_change=lambda e: result.set_text(e.value))
+        result = ui.label()
+
+        ui.separator()
+        ui.upload(on_upload=lambda e: ui.notify(f'Uploaded {e.name}')).classes('max-w-full')
+
+        def mouse_handler(e: events.MouseEventArguments):
+            color = 'SkyBlue' if e.type == 'mousedown' else 'SteelBlue'
+            # only the new circle is sent, not all circles drawn so far
+            annotations.circle(e.image_x, e.image_y, 15, fill='none', stroke=color, stroke_width=4)
+            ui.notify(f'{e.type} at ({e.image_x:.1f}, {e.image_y:.1f})')
+
+        ui.separator()
+        src = 'https://picsum.photos/id/565/640/360'
+        with ui.interactive_image(src, on_mouse=mouse_handler, events=['mousedown', 'mouseup'], cross=True):
+            annotations = AnnotationLayer(max_shapes=500)
+
+        ui.separator()
+        with ui.carousel(animated=True, arrows=True, navigation=True).props('height=180px'):
+            with ui.carousel_slide().classes('p-0'):
+                ui.image('https://picsum.photos/id/30/270/180').classes('w-[270px]')
+            with ui.carousel_slide().classes('p-0'):
+                ui.image('https://picsum.photos/id/31/270/180').classes('w-[270px]')
+            with ui.carousel_slide().classes('p-0'):
+                ui.image('https://picsum.photos/id/32/270/180').classes('w-[270px]')
+
+    def dataframe() -> None:
+        # NOTE: numpy and pandas are imported when the tab is opened for the first time, not when the server starts
+        import numpy as np
+        import pandas as pd
+        from dataframe_editor import DataFrameEditor
+        from streaming_chart import StreamingChart
+
+        ui.label('Content of Dataframe')
+        # DATAFRAME_ROWS=1000000 shows a large frame; the grid only fetches the rows in view
+        n = int(os.environ.get('DATAFRAME_ROWS', 1000))
+        words = np.array(['This', 'column', 'contains', 'strings.'])
+        df = pd.DataFrame(data={
+            'col1': np.arange(n),
+            'col2': words[np.arange(n) % len(words)],
+            'col3': np.arange(n) / 4,
+            'col4': np.arange(n) % 2 == 0,
+        })
+        DataFrameEditor(df, on_change=lambda changed: ui.notify(
+            f'Set {sum(len(rows) for rows in changed.values())} cells in {", ".join(changed)}')).classes('h-96')
+
+        ui.separator()
+        echart = StreamingChart({
+            'xAxis': {'type': 'value', 'min': 'dataMin', 'max': 'dataMax'},
+            'yAxis': {'type': 'value', 'scale': True},
+            'legend': {'textStyle': {'color': 'gray'}},
+            'animation': False,
+            'series': [
+                {'type': 'line', 'name': 'Alpha', 'showSymbol': False},
+                {'type': 'line', 'name': 'Beta', 'showSymbol': False},
+            ],
+        }, window=10.0)
+        clock = {'t': 0.0, 'values': np.zeros(2)}
+
+        def update():
+            # 500 points per second and series; the chart sends at most 60 updates per second anyway
+            t = clock['t'] + np.arange(1, 6) * 0.002
+            steps = np.random.normal(scale=0.1, size=(5, 2)).cumsum(axis=0) + clock['values']
+            for series in range(2):
+                echart.extend(series, t, steps[:, series])
+            clock['t'], clock['values'] = t[-1], steps[-1]
+
+        timer = ui.timer(0.01, update, active=False)
+        ui.switch('Stream', value=False).bind_value(timer, 'active')
+
+    def components() -> None:
+        ui.label('Content of Components')
+        def show(event: events.ValueChangeEventArguments):
+            name = type(event.sender).__name__
+            ui.notify(f'{name}: {event.value}')
+
+        with ui.row():
+            ui.button('Button 1', on_click=lambda: ui.notify('Click'))
+            ui.button('Button 2', on_click=lambda: ui.notify('Click'))
+
+        with ui.row():
+            ui.button(icon='add', on_click=lambda: ui.notify('Click'))
+            ui.button(icon='add', on_click=lambda: ui.notify('Click')).props('outline')
+            ui.button(icon='add', on_click=lambda: ui.notify('Click')).props('flat')
+
+        with ui.row():
+            ui.checkbox('Checkbox', on_change=show)
+            ui.checkbox('Checkbox', on_change=show).props('checked')
+            ui.checkbox('Checkbox', on_change=show)
             ui.separator()
-            ui.add_css('''
-                .red {
-                    color: red;
+            ui.switch('Switch', on_change=show)
+            ui.switch('Switch', on_change=show).props('checked')
+            ui.switch('Switch', on_change=show).props('checked')
+
+        ui.radio(['A', 'B', 'C'], value='A', on_change=show).props('inline')
+
+        with ui.row():
+            ui.input('Text input', on_change=show)
+            ui.select(['One', 'Two'], value='One', on_change=show)
+
+        ui.separator()
+        ui.label('Value Binding')
+        demo = Demo()
+        v = ui.checkbox('visible', value=True)
+        with ui.column().bind_visibility_from(v, 'value'):
+            ui.slider(min=1, max=3).bind_value(demo, 'number')
+            ui.toggle({1: 'A', 2: 'B', 3: 'C'}).bind_value(demo, 'number')
+            ui.number().bind_value(demo, 'number')
+
+        ui.separator()
+        ui.chat_message(['Hello NiceGUI!', 'I am a robot.'],
+            name='Robot',
+            stamp='now',
+            avatar='https://robohash.org/ui')
+
+        ui.separator()
+        with ui.button(icon='colorize') as button:
+            ui.color_picker(on_pick=lambda e: button.classes(f'!bg-[{e.color}]'))
+
+        ui.separator()
+        def alert():
+            ui.run_javascript('alert("Hello!")')
+        ui.button('fire and forget', on_click=alert)
+
+        ui.separator()
+        ui.add_css('''
+            .red {
+                color: red;
+            }
+        ''')
+        ui.label('This is red with CSS.').classes('red')
+
+        ui.add_head_html('''
+            <style>
+                .my-red-label {
+                    color: Crimson;
+                    font-weight: bold;
                 }
-            ''')
-            ui.label('This is red with CSS.').classes('red')
+            </style>
+        ''')
+        ui.label('This is red with with HTML').classes('my-red-label')
+
+        ui.link('And many more...', 'https://nicegui.io/documentation', new_tab=True).classes('mt-8')
 
-            ui.add_head_html('''
-                <style>
-                    .my-red-label {
-                        color: Crimson;
-                        font-weight: bold;
-                    }
-                </style>
-            ''')
-            ui.label('This is red with with HTML').classes('my-red-label')
+    panels = LazyTabPanels(tabs, value='Components').classes('w-full')
+    panels.add('Components', components)
+    panels.add('Widgets', widgets)
+    # the frame, the chart and its timer are only kept while the tab is shown
+    panels.add('Dataframe', dataframe, teardown=True)
 
-            ui.link('And many more...', 'https://nicegui.io/documentation', new_tab=True).classes('mt-8')
 
 @ui.page('/login')
 def login() -> Optional[RedirectResponse]:
     def try_login() -> None:  # local function to avoid passing username and password as arguments
         if passwords.get(username.value) == password.value:
             app.storage.user.update({'username': username.value, 'authenticated': True})
+            AuthMiddleware.remember(app.storage.browser['id'])
             ui.navigate.to(app.storage.user.get('referrer_path', '/'))  # go back to where the user wanted to go
         else:
             ui.notify('Wrong username or password', color='negative')
@@ -3,70 +3,110 @@
 # The assistant is created with the OpenAI API and the chat interface is created with NiceGUI
 # Source:
 # https://github.com/zauberzeug/nicegui/blob/main/examples/openai_assistant/main.py
+# Without an API key, run `local_openai.py` and start this demo with
+# `OPENAI_BASE_URL=http://127.0.0.1:8096/v1 api_key=local`.
 
+import asyncio
+import functools
+import hashlib
+import json
 from os import getenv
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
-from nicegui import ui
-from openai import AsyncOpenAI
-from openai.types.beta.assistant_stream_event import ThreadMessageInProgress
-from openai.types.beta.threads import MessageDeltaEvent, TextDeltaBlock
+from nicegui import app, ui
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+from chat_stream import MarkdownStream, text_deltas
 
 
 # NOTE: load the API key from the .env file
 load_dotenv(dotenv_path='../.env')
 api_key = getenv('api_key')
 
-# NOTE: create the OpenAI client
-client = AsyncOpenAI(api_key=api_key)
+
+# NOTE: create the OpenAI client with the first question; importing openai takes longer than starting the server
+@functools.cache
+def get_client() -> 'AsyncOpenAI':
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=api_key)
+
+
+ASSISTANT = {
+    'name': 'NiceGUI Assistant',
+    'instructions': '''
+        You are a personal assistant for NiceGUI developers.
+        Your sole focus is to help with questions about the NiceGUI framework.
+        You are precise and concise.
+        Stay on the topic.
+        Very short answers are preferred, but always be friendly and polite.
+    ''',
+    'tools': [{'type': 'code_interpreter'}],
+    'model': 'gpt-4o-mini',
+}
+assistant_lock = asyncio.Lock()
+
+
+async def get_assistant_id() -> str:
+    """Create the assistant once and reuse it for all visitors, also after a restart.
+
+    Its id is kept in the general storage under a hash of the API URL and the settings,
+    so changing the instructions creates a new assistant.
+    """
+    key = hashlib.sha256(json.dumps([str(get_client().base_url), ASSISTANT], sort_keys=True).encode()).hexdigest()[:16]
+    async with assistant_lock:  # concurrent first visitors must not create several assistants
+        assistants = app.storage.general.setdefault('assistants', {})
+        if key not in assistants:
+            assistants[key] = (await get_client().beta.assistants.create(**ASSISTANT)).id
+        return assistants[key]
+
+
+async def get_thread_id(tab: dict) -> str:
+    """The thread of the browser tab (pass `app.storage.tab`); a reload continues the conversation."""
+    if 'thread_id' not in tab:
+        tab['thread_id'] = (await get_client().beta.threads.create()).id
+    return tab['thread_id']
+
 
 # NOTE: create the NiceGUI app
 @ui.page('/')
 async def main():
-    assistant = await client.beta.assistants.create(
-        name='NiceGUI Assistant',
-        instructions='''
-            You are a personal assistant for NiceGUI developers.
-            Your sole focus is to help with questions about the NiceGUI framework.
-            You are precise and concise.
-            Stay on the topic.
-            Very short answers are preferred, but always be friendly and polite.
-        ''',
-        tools=[{'type': 'code_interpreter'}],
-        model='gpt-4o-mini',
-    )
-
-    thread = await client.beta.threads.create()
-
     async def send() -> None:
-        response.content = ''
+        response.clear()
         spinner = ui.spinner(size='5em', type='comment').classes('mx-auto')
-        await client.beta.threads.messages.create(
-            thread_id=thread.id,
-            role='user',
-            content=question.value,
-        )
-        stream = await client.beta.threads.runs.create(
-            assistant_id=assistant.id,
-            thread_id=thread.id,
-            stream=True,
-        )
-        async for chunk in stream:
-            if isinstance(chunk, ThreadMessageInProgress):
+        answered = False
+        try:
+            assistant_id, thread_id = await asyncio.gather(get_assistant_id(), get_thread_id(app.storage.tab))
+            client = get_client()
+            await client.beta.threads.messages.create(
+                thread_id=thread_id,
+                role='user',
+                content=question.value,
+            )
+            stream = await client.beta.threads.runs.create(
+                assistant_id=assistant_id,
+                thread_id=thread_id,
+                stream=True,
+            )
+            async for text in text_deltas(stream):
+                if not spinner.is_deleted:
+                    spinner.delete()
+                answered = True
+                response.append(text)  # NOTE: sent in batches and only the last paragraph is rendered again
+        finally:  # NOTE: also if the request failed or the page was closed meanwhile
+            if not spinner.is_deleted:
                 spinner.delete()
-            # NOTE: the stream contains a lot of different types so we need to filter out the ones we don't need
-            if not isinstance(chunk.data, MessageDeltaEvent) or not chunk.data.delta.content:
-                continue
-            content = chunk.data.delta.content[0]
-            if not isinstance(content, TextDeltaBlock) or content.text is None or content.text.value is None:
-                continue
-            response.content += content.text.value
+            response.flush()
+        if not answered:  # NOTE: e.g. a failed or cancelled run, or one that only used tools
+            ui.notify('The assistant did not answer, please try again', type='warning')
 
     with ui.column().classes('mx-auto w-full max-w-xl my-16'):
         ui.label('NiceGUI Assistant').classes('text-2xl font-bold mx-auto')
         question = ui.input(value='Why does NiceGUI use async/await?') \
             .classes('w-full self-center mt-4').props('hint="Ask your question" dense') \
             .on('keydown.enter', send)
-        response = ui.markdown().classes('mx-4 mt-2')
+        response = MarkdownStream().classes('mx-4 mt-2')
         ui.timer(0, send, once=True)  # NOTE: we send the prepared demo question immediately
 
-ui.run(port=8095, reload=False)
\ No newline at end of file
+ui.run(port=8095, reload=False)
@@ -0,0 +1,46 @@
+const SVG_NS = "http://www.w3.org/2000/svg";
+
+export default {
+  template: `<svg style="position:absolute;top:0;left:0;pointer-events:none" :viewBox="viewBox"></svg>`,
+  data() {
+    return {
+      viewBox: "0 0 0 0",
+    };
+  },
+  mounted() {
+    // use the coordinates of the image's own SVG overlay, which are set when the image is loaded
+    const overlay = this.$el.parentElement.querySelector(":scope > svg");
+    const sync = () => (this.viewBox = overlay.getAttribute("viewBox"));
+    this.observer = new MutationObserver(sync);
+    this.observer.observe(overlay, { attributes: true, attributeFilter: ["viewBox"] });
+    sync();
+    this.nodes = new Map();
+    this.add(Object.entries(this.shapes).map(([id, [tag, attrs]]) => [id, tag, attrs]));
+  },
+  beforeUnmount() {
+    this.observer.disconnect();
+  },
+  methods: {
+    add(shapes) {
+      for (const [id, tag, attrs] of shapes) {
+        const node = document.createElementNS(SVG_NS, tag);
+        for (const [key, value] of Object.entries(attrs)) node.setAttribute(key, value);
+        this.$el.appendChild(node);
+        this.nodes.set(String(id), node);
+      }
+    },
+    remove(ids) {
+      for (const id of ids) {
+        this.nodes.get(String(id))?.remove();
+        this.nodes.delete(String(id));
+      }
+    },
+    clear() {
+      this.nodes.forEach((node) => node.remove());
+      this.nodes.clear();
+    },
+  },
+  props: {
+    shapes: Object,
+  },
+};
@@ -0,0 +1,109 @@
+"""SVG shapes on top of a `ui.interactive_image` that are sent to the browser one by one.
+
+Appending to the `content` string of the image resends the whole overlay with every shape.
+An annotation layer keeps its shapes by id and sends only the ones that are added or removed,
+so a new shape costs the same few bytes no matter how many are shown already.
+"""
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from nicegui.element import Element
+
+Shape = Tuple[str, Dict[str, Any]]  # SVG tag and attributes
+
+
+class AnnotationLayer(Element, component='annotation_layer.js'):
+
+    def __init__(self, *, max_shapes: Optional[int] = None, min_distance: float = 0) -> None:
+        """Annotation layer
+
+        Create it inside a ``ui.interactive_image``; it uses the same image coordinates as the image's SVG content.
+
+        :param max_shapes: the oldest shapes are removed beyond this number (default: no limit)
+        :param min_distance: shapes whose center is closer than this to the center of a shown one are skipped,
+            so a dense region is drawn with one shape per `min_distance` square (default: keep all)
+        """
+        super().__init__()
+        self.max_shapes = max_shapes
+        self.min_distance = min_distance
+        self.shapes: Dict[int, Shape] = {}  # in the order they were added, also sent with the first render
+        self._props['shapes'] = self.shapes
+        self._next_id = 0
+        self._cells: Dict[Tuple[int, int], int] = {}  # grid cell of min_distance -> id of the shape in it
+
+    def add(self, tag: str, **attrs: Any) -> Optional[int]:
+        """Add an SVG shape, e.g. ``add('rect', x=10, y=10, width=5, height=5, fill='red')``.
+
+        Underscores in attribute names become dashes, e.g. `stroke_width`.
+
+        :return: id of the shape or `None` if it was skipped because of `min_distance`
+        """
+        shape_attrs = {key.replace('_', '-'): value for key, value in attrs.items()}
+        cell = self._cell(shape_attrs)
+        if cell is not None and self._is_crowded(cell, shape_attrs):
+            return None
+        shape_id = self._next_id
+        self._next_id += 1
+        self.shapes[shape_id] = (tag, shape_attrs)
+        if cell is not None:
+            self._cells[cell] = shape_id
+        removed: List[int] = []
+        while self.max_shapes is not None and len(self.shapes) > self.max_shapes:
+            oldest = next(iter(self.shapes))
+            self._forget(oldest)
+            removed.append(oldest)
+        if removed:
+            self.run_method('remove', removed)
+        self.run_method('add', [[shape_id, tag, shape_attrs]])
+        return shape_id
+
+    def circle(self, cx: float, cy: float, r: float, **attrs: Any) -> Optional[int]:
+        """Add a circle."""
+        return self.add('circle', cx=cx, cy=cy, r=r, **attrs)
+
+    def remove(self, *shape_ids: int) -> None:
+        """Remove shapes by id."""
+        removed = [shape_id for shape_id in shape_ids if shape_id in self.shapes]
+        for shape_id in removed:
+            self._forget(shape_id)
+        if removed:
+            self.run_method('remove', removed)
+
+    def clear(self) -> None:
+        """Remove all shapes."""
+        self.shapes.clear()
+        self._cells.clear()
+        self.run_method('clear')
+
+    def _forget(self, shape_id: int) -> None:
+        _, attrs = self.shapes.pop(shape_id)
+        cell = self._cell(attrs)
+        if cell is not None and self._cells.get(cell) == shape_id:
+            del self._cells[cell]
+
+    @staticmethod
+    def _center(attrs: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+        if 'cx' in attrs and 'cy' in attrs:
+            return float(attrs['cx']), float(attrs['cy'])
+        if 'x' in attrs and 'y' in attrs:
+            return (float(attrs['x']) + float(attrs.get('width', 0)) / 2,
+                    float(attrs['y']) + float(attrs.get('height', 0)) / 2)
+        return None
+
+    def _cell(self, attrs: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+        center = self._center(attrs) if self.min_distance > 0 else None
+        if center is None:
+            return None
+        return math.floor(center[0] / self.min_distance), math.floor(center[1] / self.min_distance)
+
+    def _is_crowded(self, cell: Tuple[int, int], attrs: Dict[str, Any]) -> bool:
+        """Whether the cell is taken or a shape in a neighboring cell is closer than `min_distance`."""
+        x, y = self._center(attrs)  # type: ignore[misc]
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                other = self._cells.get((cell[0] + dx, cell[1] + dy))
+                if other is not None:
+                    ox, oy = self._center(self.shapes[other][1])  # type: ignore[misc]
+                    if (ox - x) ** 2 + (oy - y) ** 2 < self.min_distance ** 2:
+                        return True
+        return cell in self._cells
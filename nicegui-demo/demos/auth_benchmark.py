@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Requests per second and p99 latency of the login demo with the old and the new auth middleware.
+
+Run with `uv run auth_benchmark.py [clients] [seconds]`. The app of `02_login_page.py` is called in-process
+through httpx' ASGI transport with the same session middlewares as `ui.run(storage_secret=...)`,
+so the numbers contain no network. Every client is logged in with its own session and requests
+a static file, a small restricted route and the restricted main page in a loop.
+"""
+import asyncio
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List
+
+os.environ['NICEGUI_STORAGE_PATH'] = tempfile.mkdtemp()  # keep the user storage files of the run out of the repo
+
+import httpx  # noqa: E402
+from fastapi import Request  # noqa: E402
+from fastapi.responses import PlainTextResponse, RedirectResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from nicegui import __version__, app  # noqa: E402
+from nicegui.storage import set_storage_secret  # noqa: E402
+
+spec = importlib.util.spec_from_file_location('login_page', Path(__file__).parent / '02_login_page.py')
+login_page = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(login_page)
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+SECONDS = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+PATHS = {
+    'static': f'/_nicegui/{__version__}/static/favicon.ico',
+    'route': '/bench/ping',
+    'page': '/',
+}
+
+
+class BaseHTTPAuthMiddleware(BaseHTTPMiddleware):
+    """The previous implementation of the demo's middleware, for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        if not app.storage.user.get('authenticated', False):
+            path = request.url.path
+            if not path.startswith('/_nicegui') and path not in login_page.unrestricted_page_routes:
+                app.storage.user['referrer_path'] = path  # remember where the user wanted to go
+                return RedirectResponse('/login')
+        return await call_next(request)
+
+
+@app.get('/bench/ping')
+def ping() -> PlainTextResponse:
+    return PlainTextResponse('pong')
+
+
+@app.get('/bench/login')
+def bench_login() -> PlainTextResponse:
+    """Does what the login page does after a correct password."""
+    app.storage.user.update({'username': 'user1', 'authenticated': True})
+    login_page.AuthMiddleware.remember(app.storage.browser['id'])
+    return PlainTextResponse('ok')
+
+
+login_page.unrestricted_page_routes.add('/bench/login')
+set_storage_secret('benchmark')
+app.config.add_run_config(reload=False, title='NiceGUI', viewport='width=device-width, initial-scale=1', favicon=None,
+                          dark=False, language='en-US', binding_refresh_interval=0.1, reconnect_timeout=3.0,
+                          message_history_length=1000, tailwind=True, prod_js=True, show_welcome_message=False)
+
+
+def use(middleware: type) -> None:
+    for i, entry in enumerate(app.user_middleware):
+        if entry.cls in {login_page.AuthMiddleware, BaseHTTPAuthMiddleware}:
+            app.user_middleware[i] = type(entry)(middleware)
+    app.middleware_stack = None  # built again with the next request
+
+
+async def client_loop(path: str, deadline: float, latencies: List[float]) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        (await client.get('/bench/login')).raise_for_status()
+        while perf_counter() < deadline:
+            t = perf_counter()
+            response = await client.get(path)
+            latencies.append(perf_counter() - t)
+            assert response.status_code == 200, (path, response.status_code)
+
+
+async def measure(path: str) -> Dict[str, float]:
+    latencies: List[float] = []
+    start = perf_counter()
+    await asyncio.gather(*(client_loop(path, start + SECONDS, latencies) for _ in range(CLIENTS)))
+    elapsed = perf_counter() - start
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': statistics.median(latencies) * 1000,
+        'p99': statistics.quantiles(latencies, n=100)[98] * 1000,
+    }
+
+
+async def main() -> None:
+    print(f'{CLIENTS} concurrent clients, {SECONDS:g} s per measurement')
+    print(f'{"middleware":<16} {"path":<8} {"req/s":>8} {"p50 ms":>8} {"p99 ms":>8}')
+    for name, middleware in [('BaseHTTP', BaseHTTPAuthMiddleware), ('pure ASGI', login_page.AuthMiddleware)]:
+        use(middleware)
+        for label, path in PATHS.items():
+            result = await measure(path)
+            print(f'{name:<16} {label:<8} {result["rps"]:>8.0f} {result["p50"]:>8.2f} {result["p99"]:>8.2f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
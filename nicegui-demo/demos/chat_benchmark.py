@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Render cost per streamed token of the chat demo, without an API key or network.
+
+Run with `uv run chat_benchmark.py [repetitions]`. The answer of `local_openai.py` (repeated to make it longer)
+is streamed through the OpenAI client over an in-process transport and rendered into a page that is never sent anywhere.
+The numbers compare `ui.markdown.content += token` with a `MarkdownStream`:
+CPU time per token (including the parsing of the stream, see "no rendering")
+and the updates and bytes of element data that would be sent to the browser.
+"""
+import asyncio
+import json
+import sys
+import warnings
+from time import perf_counter, process_time
+from typing import Callable, List
+
+import httpx
+from openai import AsyncOpenAI
+
+import local_openai
+from chat_stream import MarkdownStream, text_deltas
+
+from nicegui import Client, ui
+from nicegui.element import Element
+from nicegui.page import page
+
+warnings.filterwarnings('ignore', category=DeprecationWarning)  # the Assistants API, which the demo uses
+
+REPETITIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+local_openai.ANSWER = '\n\n'.join([local_openai.ANSWER] * REPETITIONS)
+local_openai.TOKEN_DELAY = 0.0
+
+openai = AsyncOpenAI(api_key='local', base_url='http://local/v1',
+                     http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=local_openai.app)))
+
+
+async def measure(name: str, create: Callable[[], Callable[[str], None]], finish: Callable[[], None]) -> None:
+    client = Client(page(''), request=None)
+    updates: List[int] = []
+
+    def record(element: Element) -> None:
+        updates.append(len(json.dumps(element._to_dict())))  # pylint: disable=protected-access
+    client.outbox.enqueue_update = record  # type: ignore[method-assign]
+
+    with client:
+        append = create()
+    thread = await openai.beta.threads.create()
+    stream = await openai.beta.threads.runs.create(assistant_id='asst', thread_id=thread.id, stream=True)
+    count = 0
+    start = perf_counter()
+    cpu = process_time()
+    async for text in text_deltas(stream):
+        count += 1
+        with client:
+            append(text)
+        await asyncio.sleep(0.001)  # let flush timers run, like tokens arriving over a network
+    with client:
+        finish()
+    cpu = process_time() - cpu
+    print(f'{name:<16} {count:>7} {cpu / count * 1e6:>12.1f} {len(updates):>8} '
+          f'{sum(updates) / 1000:>10.1f} {perf_counter() - start:>8.2f}')
+
+
+async def main() -> None:
+    thread = await openai.beta.threads.create()
+    stream = await openai.beta.threads.runs.create(assistant_id='asst', thread_id=thread.id, stream=True)
+    async for _ in text_deltas(stream):
+        pass  # warm up the client and the stand-in server
+    print(f'{"render":<16} {"tokens":>7} {"µs/token":>12} {"updates":>8} {"kB sent":>10} {"wall s":>8}')
+    await measure('no rendering', lambda: lambda text: None, lambda: None)
+
+    def create_markdown() -> Callable[[str], None]:
+        markdown = ui.markdown()
+
+        def append(text: str) -> None:
+            markdown.content += text
+        return append
+    await measure('content +=', create_markdown, lambda: None)
+
+    streams: List[MarkdownStream] = []
+
+    def create_stream() -> Callable[[str], None]:
+        streams.append(MarkdownStream())
+        return streams[-1].append
+    await measure('MarkdownStream', create_stream, lambda: streams[-1].flush())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
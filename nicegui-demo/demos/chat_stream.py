@@ -0,0 +1,136 @@
+"""Streaming an assistant's answer into the page without resending all of it for every token.
+
+`response.content += token` renders the whole answer to HTML again and sends it for each token.
+A `MarkdownStream` collects the tokens for `interval` seconds and splits the answer at blank lines
+that start an independent block: finished blocks stay as they are
+and only the block that is still growing is rendered and sent again.
+"""
+import asyncio
+import re
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+from nicegui import background_tasks, ui
+
+# a line after a blank line that may continue the list or quote above: indented, a list item or a quote
+CONTINUATION = re.compile(r'[ \t]|[-*+](?:[ \t]|$)|\d{1,9}[.)](?:[ \t]|$)|>', re.MULTILINE)
+# reference-style link definitions, which apply to the whole answer and not only to their own block
+DEFINITION = re.compile(r'^ {0,3}\[[^\]]+\]:[ \t]*\S.*$', re.MULTILINE)
+
+
+async def text_deltas(stream: AsyncIterator) -> AsyncIterator[str]:
+    """The text pieces of the assistant's message in an Assistants API run stream."""
+    from openai.types.beta.assistant_stream_event import ThreadMessageDelta  # only needed once a stream exists
+    from openai.types.beta.threads import TextDeltaBlock
+    async for event in stream:
+        # NOTE: the stream contains a lot of different types so we need to filter out the ones we don't need
+        if not isinstance(event, ThreadMessageDelta) or not event.data.delta.content:
+            continue
+        for content in event.data.delta.content:
+            if isinstance(content, TextDeltaBlock) and content.text is not None and content.text.value:
+                yield content.text.value
+
+
+def split_blocks(text: str) -> List[str]:
+    """Split markdown at blank lines that start an independent block; the last part is the one that can still grow.
+
+    A blank line inside a code fence is no boundary, nor is one followed by a line that may continue a list or quote,
+    e.g. the next item of a loose list or an indented paragraph of an item.
+    That line has to be complete before the blank line counts as a boundary.
+    """
+    blocks = []
+    start = 0
+    position = text.find('\n\n')
+    while position != -1:
+        following = position + 2
+        while text.startswith('\n', following):
+            following += 1
+        if text.find('\n', following) == -1:  # the following line is still incomplete
+            break
+        if text.count('```', start, position) % 2 == 0 and not CONTINUATION.match(text, following):
+            blocks.append(text[start:position])
+            start = following
+        position = text.find('\n\n', following)
+    blocks.append(text[start:])
+    return blocks
+
+
+class MarkdownStream(ui.column):
+
+    def __init__(self, *, interval: float = 1 / 20) -> None:
+        """Markdown that is appended to piece by piece
+
+        :param interval: minimum time between two updates sent to the browser
+        """
+        super().__init__()
+        self.classes('w-full gap-0')
+        self.interval = interval
+        self.text = ''  # the block that is still growing
+        self.pending = ''
+        self.block: Optional[ui.markdown] = None
+        self.finished: List[Tuple[ui.markdown, str]] = []  # elements of the finished blocks and their text
+        self.definitions = ''  # link definitions of all blocks, appended to each one that may use them
+        self._finished_definitions = ''
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._last_flush = 0.0
+
+    def append(self, text: str) -> None:
+        self.pending += text
+        if self._timer is None:
+            delay = max(0.0, self._last_flush + self.interval - time.monotonic())
+            self._timer = asyncio.get_running_loop().call_later(
+                delay, lambda: background_tasks.create(self._flush(), name='flush markdown stream'))
+
+    def flush(self) -> None:
+        """Show the pending text now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._last_flush = time.monotonic()
+        if not self.pending:
+            return
+        *finished, self.text = split_blocks(self.text + self.pending)
+        self.pending = ''
+        for block in finished:
+            self._finished_definitions += ''.join(f'{line}\n' for line in DEFINITION.findall(block))
+        definitions = self._finished_definitions + ''.join(f'{line}\n' for line in DEFINITION.findall(self.text))
+        if definitions != self.definitions:
+            self.definitions = definitions
+            for element, block in self.finished:
+                if '[' in block:
+                    element.set_content(self._source(block))
+        for block in finished:
+            self._show(block)
+            self.finished.append((self.block, block))
+            self.block = None  # the next text starts a new element
+        self._show(self.text)
+
+    async def _flush(self) -> None:
+        self.flush()  # in a task, because new elements need a slot stack
+
+    def _show(self, text: str) -> None:
+        if self.block is None:
+            with self:
+                self.block = ui.markdown(self._source(text))
+        else:
+            self.block.set_content(self._source(text))
+
+    def _source(self, text: str) -> str:
+        if not self.definitions or text.count('```') % 2:  # not into a code block that is still open
+            return text
+        return f'{text}\n\n{self.definitions}'
+
+    def clear(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.text = self.pending = self.definitions = self._finished_definitions = ''
+        self.block = None
+        self.finished.clear()
+        super().clear()
+
+    def _handle_delete(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        super()._handle_delete()
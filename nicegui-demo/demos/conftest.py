@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))  # the demos import their sibling modules like a script does
+
+pytest_plugins = ['nicegui.testing.plugin']
@@ -0,0 +1,141 @@
+"""Editable AG Grid for large pandas DataFrames.
+
+The grid uses AG Grid's infinite row model: it fetches the rows it is about to show in blocks from a JSON route,
+so neither the browser nor the page holds more than a few blocks of the frame.
+Edits are collected per column and written back with one `df.iloc` assignment per column.
+"""
+import asyncio
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pandas.api.types import (is_bool_dtype, is_datetime64_any_dtype, is_float_dtype, is_integer_dtype,
+                              is_numeric_dtype)
+
+from nicegui import app, background_tasks, events, ui
+
+_editors: Dict[str, 'DataFrameEditor'] = {}
+
+
+def column_def(name: str, dtype: Any) -> Dict[str, Any]:
+    """AG Grid column definition with a cell editor that fits the dtype."""
+    column: Dict[str, Any] = {'field': name, 'headerName': name, 'editable': True}
+    if is_bool_dtype(dtype):
+        column.update(cellDataType='boolean', cellEditor='agCheckboxCellEditor')
+    elif is_integer_dtype(dtype):
+        column.update(cellDataType='number', cellEditor='agNumberCellEditor', cellEditorParams={'precision': 0})
+    elif is_numeric_dtype(dtype):
+        column.update(cellDataType='number', cellEditor='agNumberCellEditor')
+    elif is_datetime64_any_dtype(dtype):
+        column.update(cellDataType='dateString', cellEditor='agDateStringCellEditor')
+    elif isinstance(dtype, pd.CategoricalDtype):
+        column.update(cellDataType='text', cellEditor='agSelectCellEditor',
+                      cellEditorParams={'values': [str(value) for value in dtype.categories]})
+    else:
+        column.update(cellDataType='text', cellEditor='agTextCellEditor')
+    return column
+
+
+class DataFrameEditor(ui.aggrid):
+
+    def __init__(self, df: pd.DataFrame, *, block_size: int = 100, delay: float = 0.5,
+                 on_change: Optional[Callable[[Dict[str, List[int]]], Any]] = None) -> None:
+        """DataFrame editor
+
+        Shows a DataFrame in AG Grid and writes the edits back into it.
+        Only the visible blocks of `block_size` rows are sent to the browser.
+        Edits are applied at most every `delay` seconds (and before rows are sent),
+        one vectorized assignment per column.
+        Date columns are edited as dates, so the time of an edited cell is lost.
+
+        :param df: frame with unique string column names; it is changed in place
+        :param block_size: number of rows fetched at once
+        :param delay: seconds to collect edits before they are written to the frame
+        :param on_change: called with the row positions that were written, by column name
+        """
+        self.df = df
+        self.delay = delay
+        self.on_change = on_change
+        self.key = uuid.uuid4().hex  # the route of the rows must not be guessable
+        self.pending: Dict[int, Dict[int, Any]] = {}  # column position -> row position -> value
+        self._timer: Optional[asyncio.TimerHandle] = None
+        super().__init__({
+            'columnDefs': [column_def(str(name), dtype) for name, dtype in df.dtypes.items()],
+            'defaultColDef': {'sortable': False},  # the rows are fetched in frame order
+            'suppressFieldDotNotation': True,
+            'rowModelType': 'infinite',
+            'cacheBlockSize': block_size,
+            'maxBlocksInCache': 10,
+            ':datasource': f'''{{
+                getRows: (params) => fetch(`${{window.path_prefix}}/api/dataframe/{self.key}`
+                                           + `?start=${{params.startRow}}&end=${{params.endRow}}`)
+                    .then((response) => response.json())
+                    .then((data) => params.successCallback(data.rows, data.count))
+                    .catch(() => params.failCallback()),
+            }}''',
+        }, theme='balham')
+        self.columns = {str(name): c for c, name in enumerate(df.columns)}
+        self.on('cellValueChanged', self.handle_edit, ['rowIndex', 'colId', 'newValue'])
+        _editors[self.key] = self
+
+    def handle_edit(self, e: events.GenericEventArguments) -> None:
+        c = self.columns[e.args['colId']]
+        value = e.args['newValue']
+        dtype = self.df.dtypes.iloc[c]
+        if value is None and (is_integer_dtype(dtype) or is_bool_dtype(dtype)):
+            self.run_grid_method('refreshInfiniteCache')  # the column has no missing values, show the old one again
+            return
+        self.pending.setdefault(c, {})[e.args['rowIndex']] = value
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.delay, lambda: background_tasks.create(self._flush(), name='flush dataframe edits'))
+
+    def flush(self) -> None:
+        """Write the pending edits into the frame."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self.pending = self.pending, {}
+        changed: Dict[str, List[int]] = {}
+        for c, edits in pending.items():
+            rows = list(edits)
+            values = pd.Series(list(edits.values()), dtype=object)
+            dtype = self.df.dtypes.iloc[c]
+            if is_datetime64_any_dtype(dtype):
+                values = pd.to_datetime(values)
+            elif is_float_dtype(dtype):
+                values = values.astype(float)  # None becomes NaN
+            elif not isinstance(dtype, pd.CategoricalDtype):
+                values = values.astype(dtype)
+            self.df.iloc[rows, c] = values.to_numpy()
+            changed[str(self.df.columns[c])] = rows
+        if changed and self.on_change is not None:
+            with self:  # the callback may create elements or notifications, e.g. when called from the route
+                self.on_change(changed)
+
+    async def _flush(self) -> None:
+        self.flush()  # in a task, because the timer callback has no slot stack
+
+    def rows(self, start: int, end: int) -> str:
+        """JSON with the rows from `start` to `end` and the total number of rows."""
+        self.flush()
+        chunk = self.df.iloc[start:end]
+        dates = [name for name, dtype in chunk.dtypes.items() if is_datetime64_any_dtype(dtype)]
+        if dates:
+            chunk = chunk.assign(**{str(name): chunk[name].dt.strftime('%Y-%m-%d') for name in dates})
+        return f'{{"count": {len(self.df)}, "rows": {chunk.to_json(orient="records")}}}'
+
+    def _handle_delete(self) -> None:
+        self.flush()
+        _editors.pop(self.key, None)
+        super()._handle_delete()
+
+
+@app.get('/api/dataframe/{key}')
+async def _rows(key: str, start: int, end: int) -> Response:
+    editor = _editors.get(key)
+    if editor is None:
+        raise HTTPException(status_code=404)
+    return Response(editor.rows(start, end), media_type='application/json')
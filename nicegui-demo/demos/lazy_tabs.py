@@ -0,0 +1,53 @@
+"""Tab panels whose content is created when the tab is opened for the first time.
+
+With `ui.tab_panels` every panel is built with the page, although only one of them is visible.
+`LazyTabPanels` keeps a function per panel and calls it inside the panel on its first activation;
+panels with ``teardown=True`` are emptied again when another tab is selected, so their elements, timers
+and data only live while they are shown.
+"""
+from typing import Callable, Dict, Set
+
+from nicegui import events, ui
+
+
+class LazyTabPanels(ui.tab_panels):
+
+    def __init__(self, tabs: ui.tabs, *, value: str) -> None:
+        """Lazy tab panels
+
+        :param tabs: the tabs that select the panels
+        :param value: name of the panel that is shown first
+        """
+        super().__init__(tabs, value=value, on_change=self._handle_change)
+        self.builders: Dict[str, Callable[[], None]] = {}
+        self.panels: Dict[str, ui.tab_panel] = {}
+        self.teardown: Set[str] = set()
+        self.built: Set[str] = set()
+
+    def add(self, name: str, build: Callable[[], None], *, teardown: bool = False) -> ui.tab_panel:
+        """Add a panel that is filled by `build` when it is shown.
+
+        :param name: name of the tab
+        :param build: function that creates the content of the panel
+        :param teardown: whether to delete the content when another tab is shown
+        """
+        with self:
+            self.panels[name] = ui.tab_panel(name)
+        self.builders[name] = build
+        if teardown:
+            self.teardown.add(name)
+        if name == self.value:
+            self._build(name)
+        return self.panels[name]
+
+    def _handle_change(self, e: events.ValueChangeEventArguments) -> None:
+        for name in self.built & self.teardown - {e.value}:
+            self.panels[name].clear()
+            self.built.discard(name)
+        if e.value in self.builders and e.value not in self.built:
+            self._build(e.value)
+
+    def _build(self, name: str) -> None:
+        with self.panels[name]:
+            self.builders[name]()
+        self.built.add(name)
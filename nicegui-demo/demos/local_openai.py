@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Local stand-in for the parts of the OpenAI Assistants API that the chat demo uses.
+
+It answers every question with the same markdown text, streamed word by word
+with the same server-sent events as the real API, so the chat can be tried and measured offline.
+Run with `uv run local_openai.py [port]` and start the demo with
+`OPENAI_BASE_URL=http://127.0.0.1:8096/v1 api_key=local uv run 03_chat_with_ai.py`.
+"""
+import asyncio
+import itertools
+import json
+import re
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+ANSWER = '''NiceGUI uses **async/await** because it runs on top of FastAPI and uvicorn, which serve all clients
+from a single event loop.
+
+While a handler waits for I/O, e.g. a database query or an HTTP request, other handlers keep running:
+
+1. Define the handler with `async def`.
+2. `await` the slow calls inside of it.
+3. Keep CPU-heavy work in `run.cpu_bound` so that the loop stays responsive.
+
+```py
+@ui.page('/')
+async def index():
+    data = await fetch_data()
+    ui.label(data)
+```
+
+This way one process can handle many users without threads.
+'''
+TOKEN_DELAY = 0.01  # seconds between two text deltas, like a fast model
+
+app = FastAPI()
+_ids = itertools.count()
+
+
+def tokens(text: str) -> List[str]:
+    """Pieces of roughly the size of the tokens of the real API: words with their leading whitespace."""
+    return re.findall(r'\s*\S+', text)
+
+
+def _new_id(prefix: str) -> str:
+    return f'{prefix}_{next(_ids)}'
+
+
+def _message(message_id: str, thread_id: str, status: str, text: str = '') -> Dict[str, Any]:
+    return {
+        'id': message_id, 'object': 'thread.message', 'created_at': int(time.time()), 'thread_id': thread_id,
+        'status': status, 'role': 'assistant', 'assistant_id': None, 'run_id': None, 'attachments': [], 'metadata': {},
+        'content': [{'type': 'text', 'text': {'value': text, 'annotations': []}}] if text else [],
+    }
+
+
+def _event(name: str, data: Any) -> str:
+    return f'event: {name}\ndata: {json.dumps(data)}\n\n'
+
+
+@app.post('/v1/assistants')
+async def create_assistant(request: Request) -> Dict[str, Any]:
+    body = await request.json()
+    return {'id': _new_id('asst'), 'object': 'assistant', 'created_at': int(time.time()), 'description': None,
+            'metadata': {}, 'name': body.get('name'), 'instructions': body.get('instructions'),
+            'model': body['model'], 'tools': body.get('tools', [])}
+
+
+@app.post('/v1/threads')
+async def create_thread() -> Dict[str, Any]:
+    return {'id': _new_id('thread'), 'object': 'thread', 'created_at': int(time.time()), 'metadata': {}}
+
+
+@app.post('/v1/threads/{thread_id}/messages')
+async def create_message(thread_id: str, request: Request) -> Dict[str, Any]:
+    body = await request.json()
+    message = _message(_new_id('msg'), thread_id, 'completed', body['content'])
+    message['role'] = 'user'
+    return message
+
+
+@app.post('/v1/threads/{thread_id}/runs')
+async def create_run(thread_id: str, request: Request) -> StreamingResponse:
+    body = await request.json()
+    run = {'id': _new_id('run'), 'object': 'thread.run', 'created_at': int(time.time()), 'thread_id': thread_id,
+           'assistant_id': body['assistant_id'], 'status': 'queued', 'model': 'local', 'instructions': '',
+           'tools': [], 'metadata': {}}
+
+    async def events() -> AsyncIterator[str]:
+        message_id = _new_id('msg')
+        yield _event('thread.run.created', run)
+        yield _event('thread.run.in_progress', {**run, 'status': 'in_progress'})
+        yield _event('thread.message.created', _message(message_id, thread_id, 'in_progress'))
+        yield _event('thread.message.in_progress', _message(message_id, thread_id, 'in_progress'))
+        for token in tokens(ANSWER):
+            yield _event('thread.message.delta', {
+                'id': message_id, 'object': 'thread.message.delta',
+                'delta': {'content': [{'index': 0, 'type': 'text', 'text': {'value': token, 'annotations': []}}]},
+            })
+            if TOKEN_DELAY:
+                await asyncio.sleep(TOKEN_DELAY)
+        yield _event('thread.message.completed', _message(message_id, thread_id, 'completed', ANSWER))
+        yield _event('thread.run.completed', {**run, 'status': 'completed'})
+        yield 'event: done\ndata: [DONE]\n\n'
+
+    return StreamingResponse(events(), media_type='text/event-stream')
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='127.0.0.1', port=int(sys.argv[1]) if len(sys.argv) > 1 else 8096)
@@ -0,0 +1,77 @@
+"""Progress reports from `run.cpu_bound` jobs, sent through one local datagram socket per server process.
+
+A `multiprocessing.Manager().Queue()` per page starts a manager process for every visitor and has to be polled.
+Here the worker processes send small datagrams to a single socket of the server, which forwards each value
+to the callback of the job that sent it; nothing runs while no job is reporting.
+"""
+import asyncio
+import socket
+import struct
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from nicegui import app, run
+
+MESSAGE = struct.Struct('!Id')  # job number, progress
+
+_worker_socket: Optional[socket.socket] = None  # one per worker process, created on the first report
+
+
+class Progress:
+    """Report function handed to a job.
+
+    It is pickled into the worker process and sends at most one value per interval.
+    """
+
+    def __init__(self, address: Tuple[str, int], job: int, interval: float) -> None:
+        self.address = address
+        self.job = job
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, value: float) -> None:
+        global _worker_socket  # pylint: disable=global-statement
+        now = time.monotonic()
+        if now - self._last < self.interval and value < 1:
+            return
+        self._last = now
+        if _worker_socket is None:
+            _worker_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        _worker_socket.sendto(MESSAGE.pack(self.job, value), self.address)
+
+
+class ProgressChannel(asyncio.DatagramProtocol):
+    """Runs functions with `run.cpu_bound` and passes their progress to a callback per job."""
+
+    def __init__(self, interval: float = 0.1) -> None:
+        self.interval = interval
+        self.callbacks: Dict[int, Callable[[float], Any]] = {}
+        self.address: Optional[Tuple[str, int]] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._next_job = 0
+        app.on_shutdown(self.close)
+
+    async def run(self, func: Callable[..., Any], *args: Any, on_progress: Callable[[float], Any]) -> Any:
+        """Run ``func(progress, *args)`` in the process pool; every ``progress(value)`` ends up in `on_progress`."""
+        if self._transport is None:
+            self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: self, local_addr=('127.0.0.1', 0))
+            self.address = self._transport.get_extra_info('sockname')
+        job = self._next_job
+        self._next_job += 1
+        self.callbacks[job] = on_progress
+        try:
+            return await run.cpu_bound(func, Progress(self.address, job, self.interval), *args)
+        finally:
+            del self.callbacks[job]  # late datagrams of this job are dropped
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        job, value = MESSAGE.unpack(data)
+        callback = self.callbacks.get(job)
+        if callback is not None:
+            callback(value)
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
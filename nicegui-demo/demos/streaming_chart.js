@@ -0,0 +1,58 @@
+import "echarts";
+import { convertDynamicProperties } from "../../static/utils/dynamic_properties.js";
+
+export default {
+  template: "<div></div>",
+  created() {
+    this.data = this.options.series.map(() => []); // picked points
+    this.tails = this.options.series.map(() => null); // latest point
+    this.frame = null;
+  },
+  async mounted() {
+    await new Promise((resolve) => setTimeout(resolve, 0)); // wait for Tailwind classes to be applied
+    this.chart = echarts.init(this.$el, null, { renderer: this.renderer });
+    this.chart.on("click", (e) => this.$emit("pointClick", e));
+    new ResizeObserver(() => this.chart.resize()).observe(this.$el);
+    this.update_chart();
+  },
+  beforeUnmount() {
+    if (this.frame) cancelAnimationFrame(this.frame);
+    this.chart.dispose();
+  },
+  methods: {
+    update_chart() {
+      convertDynamicProperties(this.options, true);
+      this.chart.setOption(this.options);
+      this.render();
+    },
+    apply_deltas(deltas) {
+      for (const [index, delta] of Object.entries(deltas)) {
+        if (delta.replace) {
+          this.data[index] = delta.replace;
+        } else {
+          this.data[index].splice(0, delta.drop);
+          this.data[index].push(...delta.append);
+        }
+        this.tails[index] = delta.tail;
+      }
+      // all deltas of one animation frame are drawn at once
+      if (!this.frame) this.frame = requestAnimationFrame(this.render);
+    },
+    render() {
+      this.frame = null;
+      const series = this.data.map((data, i) => ({ data: this.tails[i] ? [...data, this.tails[i]] : data }));
+      this.chart?.setOption({ series });
+    },
+    run_chart_method(name, ...args) {
+      if (name.startsWith(":")) {
+        name = name.slice(1);
+        args = args.map((arg) => new Function(`return (${arg})`)());
+      }
+      return runMethod(this.chart, name, args);
+    },
+  },
+  props: {
+    options: Object,
+    renderer: String,
+  },
+};
@@ -0,0 +1,167 @@
+"""Line chart for live data that sends the browser only what changed.
+
+Every series keeps its latest points in a fixed-size NumPy ring buffer and is downsampled with LTTB
+(Largest-Triangle-Three-Buckets) into at most `max_points` buckets of the visible window.
+A bucket's point is picked once, when the bucket is complete, so at most `fps` times per second
+the browser gets a delta: picked points to drop at the front, new picked points, and the latest raw point.
+The browser draws all deltas that arrive within one animation frame with a single `setOption` call.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from nicegui import ui
+
+
+class RingBuffer:
+    """The latest `capacity` (x, y) points; `total` counts all points ever added."""
+
+    def __init__(self, capacity: int) -> None:
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.total = 0
+
+    def __len__(self) -> int:
+        return min(self.total, len(self.x))
+
+    @property
+    def first(self) -> int:
+        """Number of the oldest point that is still kept."""
+        return self.total - len(self)
+
+    def extend(self, x: np.ndarray, y: np.ndarray) -> None:
+        capacity = len(self.x)
+        if len(x) > capacity:  # only the last points would survive anyway
+            self.total += len(x) - capacity
+            x, y = x[-capacity:], y[-capacity:]
+        positions = np.arange(self.total, self.total + len(x)) % capacity
+        self.x[positions] = x
+        self.y[positions] = y
+        self.total += len(x)
+
+    def since(self, start: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The kept points from number `start` on, oldest first."""
+        positions = np.arange(max(start, self.first), self.total) % len(self.x)
+        return self.x[positions], self.y[positions]
+
+
+class Series:
+    """Ring buffer of a series and the LTTB points that were picked from it so far."""
+
+    def __init__(self, capacity: int) -> None:
+        self.buffer = RingBuffer(capacity)
+        self.picked: Deque[Tuple[float, float, int]] = deque()  # x, y and number of the point
+        self.next = 0  # number of the first point of the bucket that is not complete yet
+
+    def pick(self, keys_of: Callable[[np.ndarray, int], np.ndarray], window: Optional[float]) -> Dict[str, Any]:
+        """Pick the points of all complete buckets and return what the browser has to change.
+
+        :param keys_of: function that maps the x values and the number of the first point to bucket keys
+        :param window: range of x values up to the latest point that is kept in the browser
+        """
+        start = max(self.next, self.buffer.first)
+        x, y = self.buffer.since(start)
+        if not len(x):
+            return {'drop': 0, 'append': [], 'tail': None}
+        keys = keys_of(x, start)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+        append: List[List[float]] = []
+        for b in range(len(starts) - 1):  # the last bucket can still grow
+            lo, hi = starts[b], starts[b + 1]
+            end = starts[b + 2] if b + 2 < len(starts) else len(x)  # the next bucket, as far as it is known
+            if self.picked:
+                ax, ay, _ = self.picked[-1]
+                mean_x, mean_y = x[hi:end].mean(), y[hi:end].mean()
+                area = np.abs((ax - mean_x) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y - ay))
+                j = lo + int(area.argmax())
+            else:
+                j = lo
+            self.picked.append((float(x[j]), float(y[j]), start + int(j)))
+            append.append([float(x[j]), float(y[j])])
+        self.next = start + int(starts[-1])
+        drop = 0
+        while self.picked and (self.picked[0][0] < x[-1] - window if window is not None
+                               else self.picked[0][2] < self.buffer.first):
+            self.picked.popleft()
+            drop += 1
+        return {'drop': drop, 'append': append, 'tail': [float(x[-1]), float(y[-1])]}
+
+    def all_points(self) -> Dict[str, Any]:
+        """A delta that replaces everything the browser shows."""
+        x, y = self.buffer.since(self.buffer.total - 1)
+        return {
+            'replace': [[px, py] for px, py, _ in self.picked],
+            'tail': [float(x[-1]), float(y[-1])] if len(x) else None,
+        }
+
+
+class StreamingChart(ui.echart, component='streaming_chart.js'):
+
+    def __init__(self, options: Dict[str, Any], *, capacity: int = 10_000, window: Optional[float] = None,
+                 max_points: int = 1000, fps: float = 60) -> None:
+        """Streaming chart
+
+        An EChart for series that keep growing, e.g. live metrics.
+        Add points with `push` or `extend`; the `data` of the series in `options` is never sent.
+
+        :param options: dictionary of EChart options with the series (usually of type "line")
+        :param capacity: number of points kept per series
+        :param window: range of x values shown up to the latest point (default: all kept points)
+        :param max_points: number of LTTB buckets the shown points are downsampled to
+        :param fps: maximum number of updates sent per second
+        """
+        super().__init__(options)
+        self.series = [Series(capacity) for _ in options['series']]
+        self.window = window
+        self.max_points = max_points
+        self.per_bucket = math.ceil(capacity / max_points)  # without a window the buckets are counted in points
+        self.interval = 1 / fps
+        self._dirty: Set[int] = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._last_flush = 0.0
+        self.client.on_connect(self._resend)
+
+    def push(self, series: int, x: float, y: float) -> None:
+        """Add a point to a series."""
+        self.extend(series, np.array([x]), np.array([y]))
+
+    def extend(self, series: int, x: np.ndarray, y: np.ndarray) -> None:
+        """Add points to a series; x must increase."""
+        self.series[series].buffer.extend(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        self._dirty.add(series)
+        if self._timer is None:
+            delay = max(0.0, self._last_flush + self.interval - time.monotonic())
+            self._timer = asyncio.get_running_loop().call_later(delay, self.flush)
+
+    def flush(self) -> None:
+        """Send the changes of all series that got new points."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._last_flush = time.monotonic()
+        deltas = {i: self.series[i].pick(self._keys, self.window) for i in sorted(self._dirty)}
+        self._dirty.clear()
+        if deltas:
+            self.run_method('apply_deltas', deltas)
+
+    def _keys(self, x: np.ndarray, start: int) -> np.ndarray:
+        if self.window is not None:
+            return np.floor(x / (self.window / self.max_points)).astype(np.int64)
+        return np.arange(start, start + len(x)) // self.per_bucket
+
+    def _resend(self) -> None:
+        """A reconnected browser has no points at all."""
+        self.flush()
+        self.run_method('apply_deltas', {i: series.all_points() for i, series in enumerate(self.series)})
+
+    def _handle_delete(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._resend in self.client.connect_handlers:  # the client outlives charts of cleared containers
+            self.client.connect_handlers.remove(self._resend)
+        super()._handle_delete()
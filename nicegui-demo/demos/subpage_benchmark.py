@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Time to first render and memory per client of the tabbed subpage of the login demo.
+
+Run with `uv run subpage_benchmark.py [clients]`. The page is requested in-process like in `auth_benchmark.py`
+(the app is set up there). Every request builds a client that is never connected and therefore stays alive,
+so the memory they hold is measured after a second round of requests.
+"""
+import asyncio
+import gc
+import statistics
+import sys
+import tracemalloc
+from time import perf_counter
+
+import httpx
+
+from auth_benchmark import app
+
+from nicegui import Client, ui
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+
+async def main() -> None:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as http:
+        (await http.get('/bench/login')).raise_for_status()
+        (await http.get('/subpage')).raise_for_status()  # warm up imports and caches
+        times = []
+        for _ in range(CLIENTS):
+            start = perf_counter()
+            response = await http.get('/subpage')
+            times.append(perf_counter() - start)
+            response.raise_for_status()
+        known = set(Client.instances)
+        gc.collect()
+        tracemalloc.start()  # after the timing, because tracing slows everything down
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(CLIENTS):
+            (await http.get('/subpage')).raise_for_status()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    clients = [client for client_id, client in Client.instances.items() if client_id not in known]
+    elements = sum(len(client.elements) for client in clients) / len(clients)
+    timers = sum(isinstance(element, ui.timer) for client in clients for element in client.elements.values())
+    print(f'{len(clients)} clients of /subpage')
+    print(f'time to first render: p50 {statistics.median(times) * 1000:.1f} ms, max {max(times) * 1000:.1f} ms')
+    print(f'page size:            {len(response.content) / 1024:.0f} kB')
+    print(f'memory per client:    {(after - before) / len(clients) / 1024:.0f} kB')
+    print(f'elements per client:  {elements:.0f}')
+    print(f'timers per client:    {timers / len(clients):.0f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
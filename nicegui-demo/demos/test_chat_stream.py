@@ -0,0 +1,57 @@
+from typing import List
+
+from nicegui import ui
+from nicegui.testing import User
+
+from chat_stream import MarkdownStream, split_blocks
+
+# pylint: disable=missing-function-docstring
+
+ANSWER = '''Steps:
+
+1. Install NiceGUI.
+
+    Use a virtual environment.
+
+2. Read the [docs][1].
+
+See also the [examples][2].
+
+[1]: https://nicegui.io/documentation
+[2]: https://github.com/zauberzeug/nicegui/tree/main/examples
+'''
+
+
+def test_lists_stay_in_one_block() -> None:
+    assert split_blocks('1. one\n\n2. two\n\n- three\n\n    more about three\n\n> quote\n\n> more\n\nText\n') == \
+        ['1. one\n\n2. two\n\n- three\n\n    more about three\n\n> quote\n\n> more', 'Text\n']
+
+
+def test_incomplete_lines_do_not_finish_a_block() -> None:
+    assert split_blocks('1. one\n\n2') == ['1. one\n\n2']
+    assert split_blocks('Text\n\nMore') == ['Text\n\nMore']
+    assert split_blocks('Text\n\nMore\n') == ['Text', 'More\n']
+
+
+def test_blank_lines_in_code_fences_are_no_boundaries() -> None:
+    assert split_blocks('```\na\n\nb\n```\n\nText\n') == ['```\na\n\nb\n```', 'Text\n']
+
+
+async def test_streamed_answer_keeps_numbering_and_reference_links(user: User) -> None:
+    streams: List[MarkdownStream] = []
+
+    @ui.page('/')
+    def page():
+        streams.append(MarkdownStream())
+
+    await user.open('/')
+    stream = streams[0]
+    with stream:
+        for start in range(0, len(ANSWER), 7):  # in pieces, flushed like the timer does between them
+            stream.append(ANSWER[start:start + 7])
+            stream.flush()
+    html = ''.join(element.props['innerHTML'] for element in stream.default_slot.children)
+    assert html.count('<ol>') == 1
+    assert '<code>' not in html  # the indented paragraph belongs to the first item
+    assert '<a href="https://nicegui.io/documentation">docs</a>' in html
+    assert '<a href="https://github.com/zauberzeug/nicegui/tree/main/examples">examples</a>' in html
@@ -0,0 +1,238 @@
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import httpx
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from PIL import Image, ImageOps
+
+from nicegui import app, run
+
+VARIANTS = {
+    # name: (width, height, crop)
+    'thumb': (300, 200, True),
+    'screen': (1920, 1080, False),
+}
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tif', '.tiff'}
+SAFE_ID = re.compile(r'^[\w][\w.-]*$')
+
+
+def resize(source: str, target: str, width: int, height: int, crop: bool) -> None:
+    """Write a resized JPEG of `source` to `target` (runs in the process pool)."""
+    with Image.open(source) as image:
+        image.draft('RGB', (width, height))  # let the JPEG decoder skip pixels we are going to throw away
+        image = ImageOps.exif_transpose(image)
+        if crop:
+            image = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+        else:
+            image.thumbnail((width, height), Image.Resampling.LANCZOS)
+        temporary = f'{target}.{os.getpid()}.tmp'
+        image.convert('RGB').save(temporary, 'JPEG', quality=85, optimize=True, progressive=True)
+    os.replace(temporary, target)  # readers never see a half-written file
+
+
+class DiskCache:
+    """Files on disk, evicted in least-recently-used order once `max_bytes` is exceeded.
+
+    Pinned entries are being read, e.g. by a resize job, and are only evicted after they are released.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries: OrderedDict[str, int] = OrderedDict()
+        self.pinned: Dict[str, int] = {}  # key -> number of readers
+        for path in self.directory.glob('*.tmp'):  # left over from an interrupted download
+            path.unlink()
+        files = [p for p in self.directory.iterdir() if p.is_file()]
+        for path in sorted(files, key=lambda p: p.stat().st_atime):  # rebuild the LRU order after a restart
+            self._add(path.name, path.stat().st_size)
+
+    def path(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached file and mark it as recently used."""
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.path(key)
+
+    def add(self, key: str) -> Path:
+        """Register a file that was written to `path(key)`."""
+        path = self.path(key)
+        self._add(key, path.stat().st_size)
+        return path
+
+    @contextmanager
+    def pin(self, key: str) -> Iterator[None]:
+        """Keep an entry from being evicted while it is read."""
+        self.pinned[key] = self.pinned.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            self.pinned[key] -= 1
+            if not self.pinned[key]:
+                del self.pinned[key]
+                self._evict()
+
+    def _add(self, key: str, size: int) -> None:
+        self.total_bytes += size - self.entries.pop(key, 0)
+        self.entries[key] = size
+        self._evict()
+
+    def _evict(self) -> None:
+        for old_key in list(self.entries)[:-1]:  # the newest entry is kept even if it alone exceeds the limit
+            if self.total_bytes <= self.max_bytes:
+                break
+            if old_key not in self.pinned:
+                self.total_bytes -= self.entries.pop(old_key)
+                self.path(old_key).unlink(missing_ok=True)
+
+
+class PicsumSource:
+    """Image list and originals from https://picsum.photos; the full list is cached for `ttl` seconds."""
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        self.ttl = ttl
+        self.client = httpx.AsyncClient(follow_redirects=True, timeout=30)
+        self._images: List[Dict[str, Any]] = []
+        self._expires = 0.0
+        self._lock = asyncio.Lock()  # page loads during a refresh wait for it instead of fetching the list again
+        self._download_urls: Dict[str, str] = {}
+
+    async def list_images(self) -> List[Dict[str, Any]]:
+        async with self._lock:
+            if time.monotonic() >= self._expires:
+                images: List[Dict[str, Any]] = []
+                page = 1
+                while True:  # the API pages with at most 100 images each, a shorter page is the last one
+                    response = await self.client.get(f'https://picsum.photos/v2/list?page={page}&limit=100')
+                    response.raise_for_status()  # an error is not cached, the next page load tries again
+                    batch = response.json()
+                    images += batch
+                    if len(batch) < 100:
+                        break
+                    page += 1
+                for image in images:
+                    self._download_urls[str(image['id'])] = image['download_url']
+                self._images, self._expires = images, time.monotonic() + self.ttl
+        return self._images
+
+    async def original(self, image_id: str, cache: DiskCache) -> Path:
+        key = f'original-{image_id}'
+        path = cache.get(key)
+        if path is not None:
+            return path
+        url = self._download_urls.get(image_id)
+        if url is None:  # not listed by this process yet
+            response = await self.client.get(f'https://picsum.photos/id/{image_id}/info')
+            if response.status_code != 200:
+                raise HTTPException(404)
+            url = response.json()['download_url']
+        temporary = cache.path(f'{key}.tmp')
+        async with self.client.stream('GET', url) as response:
+            if response.status_code != 200:
+                raise HTTPException(404)
+            with temporary.open('wb') as f:
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+        temporary.replace(cache.path(key))
+        return cache.add(key)
+
+
+class LocalSource:
+    """Images from a local directory, so the gallery works offline.
+
+    File names may contain characters that are not allowed in an image id, so each file gets a hash of its name as id.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory).expanduser()
+        self._images: List[Dict[str, Any]] = []
+        self._names: Dict[str, str] = {}  # id -> file name
+        self._mtime: Optional[int] = None
+
+    async def list_images(self) -> List[Dict[str, Any]]:
+        return await run.io_bound(self._list)
+
+    def _list(self) -> List[Dict[str, Any]]:
+        """The directory is only scanned again after files were added, removed or renamed."""
+        mtime = self.directory.stat().st_mtime_ns
+        if mtime != self._mtime:
+            names = sorted(p.name for p in self.directory.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+            ids = {hashlib.sha1(name.encode()).hexdigest()[:16]: name for name in names}
+            self._images = [{'id': id_} for id_ in ids]
+            self._names = ids
+            self._mtime = mtime
+        return self._images
+
+    async def original(self, image_id: str, cache: DiskCache) -> Path:
+        if image_id not in self._names:  # e.g. requested by a browser that loaded the gallery before a restart
+            await self.list_images()
+        name = self._names.get(image_id)
+        if name is None or not (self.directory / name).is_file():
+            raise HTTPException(404)
+        return self.directory / name
+
+
+class ImageProxy:
+    """Serves resized variants of remote or local images from an on-disk LRU cache.
+
+    Originals are fetched once, variants are produced with Pillow in the process pool
+    and answered with an ETag and long-lived cache headers.
+    """
+
+    def __init__(self, source: Any, *,
+                 cache_dir: str = '.cache/lightbox', max_bytes: int = 512 * 1024**2, route: str = '/images') -> None:
+        self.source = source
+        self.cache = DiskCache(Path(cache_dir), max_bytes)
+        self.route = route
+        self._pending: Dict[str, asyncio.Future] = {}
+        app.add_api_route(f'{route}/{{image_id}}/{{variant}}', self._serve, methods=['GET'])
+
+    async def list_images(self) -> List[Dict[str, Any]]:
+        """All images of the source; the source caches the listing."""
+        return await self.source.list_images()
+
+    def url(self, image_id: Any, variant: str) -> str:
+        return f'{self.route}/{image_id}/{variant}'
+
+    async def _serve(self, request: Request, image_id: str, variant: str) -> Response:
+        if variant not in VARIANTS or not SAFE_ID.match(image_id):
+            raise HTTPException(404)
+        path = await self._variant(image_id, variant)
+        stat = path.stat()
+        etag = '"' + hashlib.sha1(f'{path.name}-{stat.st_mtime_ns}-{stat.st_size}'.encode()).hexdigest()[:16] + '"'
+        headers = {'ETag': etag, 'Cache-Control': 'public, max-age=31536000, immutable'}
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers=headers)
+        return FileResponse(path, media_type='image/jpeg', headers=headers)
+
+    async def _variant(self, image_id: str, variant: str) -> Path:
+        key = f'{variant}-{image_id}.jpg'
+        return self.cache.get(key) or await self._once(key, lambda: self._produce(image_id, variant, key))
+
+    async def _produce(self, image_id: str, variant: str, key: str) -> Path:
+        original = f'original-{image_id}'
+        width, height, crop = VARIANTS[variant]
+        with self.cache.pin(original):  # other downloads and resizes must not evict it before it is read
+            source = await self._once(original, lambda: self.source.original(image_id, self.cache))
+            await run.cpu_bound(resize, str(source), str(self.cache.path(key)), width, height, crop)
+        return self.cache.add(key)
+
+    async def _once(self, key: str, produce: Callable[[], Awaitable[Path]]) -> Path:
+        """Several clients asking for the same missing file share one download or resize job."""
+        if key not in self._pending:
+            self._pending[key] = asyncio.ensure_future(produce())
+            self._pending[key].add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(self._pending[key])
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
-from typing import List
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
 
-import httpx
+from image_proxy import ImageProxy, LocalSource, PicsumSource
 
 from nicegui import events, ui
 
@@ -9,49 +12,89 @@ from nicegui import events, ui
 class Lightbox:
     """A thumbnail gallery where each image can be clicked to enlarge.
     Inspired by https://lokeshdhakar.com/projects/lightbox2/.
+
+    Only one page of thumbnails exists as elements; changing the page reuses them with new sources.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, page_size: int = 30, thumb_classes: str = '') -> None:
         with ui.dialog().props('maximized').classes('bg-black') as self.dialog:
             ui.keyboard(self._handle_key)
             self.large_image = ui.image().props('no-spinner fit=scale-down')
         self.image_list: List[str] = []
+        self.thumb_list: List[str] = []
+        self.image_index: Dict[str, int] = {}  # orig_url -> position, so navigation never scans the list
+        self.current: Optional[int] = None
+        self.page_size = page_size
+        self.thumb_classes = thumb_classes
+        self.slots: List[ui.image] = []
+        self.gallery = ui.row().classes('w-full')
+        self.pagination = ui.pagination(1, 1, direction_links=True, on_change=self._show_page)
+        self.pagination.visible = False
+
+    def add_image(self, thumb_url: str, orig_url: str) -> None:
+        """Add an image to the gallery; an element is only created if it lands on the visible page."""
+        self.add_images([(thumb_url, orig_url)])
+
+    def add_images(self, images: Iterable[Tuple[str, str]]) -> None:
+        """Add (thumb_url, orig_url) pairs and update the visible page once."""
+        for thumb_url, orig_url in images:
+            self.image_index[orig_url] = len(self.image_list)
+            self.image_list.append(orig_url)
+            self.thumb_list.append(thumb_url)
+        pages = max(1, math.ceil(len(self.image_list) / self.page_size))
+        self.pagination.max = pages
+        self.pagination.visible = pages > 1
+        self._show_page()
+
+    def open(self, orig_url: str) -> None:
+        self._open(self.image_index[orig_url])
 
-    def add_image(self, thumb_url: str, orig_url: str) -> ui.image:
-        """Place a thumbnail image in the UI and make it clickable to enlarge."""
-        self.image_list.append(orig_url)
-        with ui.button(on_click=lambda: self._open(orig_url)).props('flat dense square'):
-            return ui.image(thumb_url)
+    def _show_page(self) -> None:
+        first = (self.pagination.value - 1) * self.page_size
+        visible = self.thumb_list[first:first + self.page_size]
+        while len(self.slots) < len(visible):
+            slot = len(self.slots)
+            with self.gallery, ui.button(on_click=lambda slot=slot: self._open_slot(slot)).props('flat dense square'):
+                self.slots.append(ui.image().classes(self.thumb_classes))
+        for slot, image in enumerate(self.slots):
+            if slot < len(visible):
+                image.set_source(visible[slot])
+            image.parent_slot.parent.visible = slot < len(visible)
+
+    def _open_slot(self, slot: int) -> None:
+        self._open((self.pagination.value - 1) * self.page_size + slot)
 
     def _handle_key(self, event_args: events.KeyEventArguments) -> None:
-        if not event_args.action.keydown:
+        if not event_args.action.keydown or self.current is None:
             return
         if event_args.key.escape:
             self.dialog.close()
-        image_index = self.image_list.index(self.large_image.source)
-        if event_args.key.arrow_left and image_index > 0:
-            self._open(self.image_list[image_index - 1])
-        if event_args.key.arrow_right and image_index < len(self.image_list) - 1:
-            self._open(self.image_list[image_index + 1])
-
-    def _open(self, url: str) -> None:
-        self.large_image.set_source(url)
+        if event_args.key.arrow_left and self.current > 0:
+            self._open(self.current - 1)
+        if event_args.key.arrow_right and self.current < len(self.image_list) - 1:
+            self._open(self.current + 1)
+
+    def _open(self, index: int) -> None:
+        self.current = index
+        self.large_image.set_source(self.image_list[index])
         self.dialog.open()
+        # let the browser download the neighbours now, so the arrow keys show them instantly
+        neighbours = [self.image_list[i] for i in (index - 1, index + 1) if 0 <= i < len(self.image_list)]
+        ui.run_javascript(f'{json.dumps(neighbours)}.forEach(url => {{ new Image().src = url; }});')
+
+
+# set LIGHTBOX_IMAGES to a local directory of pictures to run the gallery offline
+images_dir = os.environ.get('LIGHTBOX_IMAGES')
+proxy = ImageProxy(LocalSource(images_dir) if images_dir else PicsumSource(ttl=300))
 
 
 @ui.page('/')
 async def page():
-    lightbox = Lightbox()
-    async with httpx.AsyncClient() as client:  # using async httpx instead of sync requests to avoid blocking the event loop
-        images = await client.get('https://picsum.photos/v2/list?page=4&limit=30')
-    with ui.row().classes('w-full'):
-        for image in images.json():  # picsum returns a list of images as json data
-            # we can use the image ID to construct the image URLs
-            image_base_url = f'https://picsum.photos/id/{image["id"]}'
-            # the lightbox allows us to add images which can be opened in a full screen dialog
-            lightbox.add_image(
-                thumb_url=f'{image_base_url}/300/200',
-                orig_url=f'{image_base_url}/{image["width"]}/{image["height"]}',
-            ).classes('w-[300px] h-[200px]')
+    lightbox = Lightbox(page_size=30, thumb_classes='w-[300px] h-[200px]')
+    # the full listing is cached by the source, so page loads neither hit the picsum API nor rescan the directory;
+    # the lightbox only creates elements for the visible page of it
+    images = await proxy.list_images()
+    # the proxy serves resized and cached variants from this server instead of the remote host
+    lightbox.add_images((proxy.url(image['id'], 'thumb'), proxy.url(image['id'], 'screen')) for image in images)
 
 ui.run()
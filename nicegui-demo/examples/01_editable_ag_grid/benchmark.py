@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Block latency of SqliteRowSource on a large table, as seen by a scrolling grid.
+
+Run with `uv run benchmark.py [rows]`; the table is created in a temporary directory.
+Each scenario first asks for the top block (what the grid requests after a sort or filter change),
+then for random 100-row blocks (what it requests while scrolling), bypassing the block cache,
+and reports the first-block latency and the p50/p99 scroll latency against the target.
+"""
+import random
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from datasource import SqliteRowSource
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+BLOCK = 100
+SAMPLES = 200
+TARGET_P99_MS = 50
+NAMES = ['Alice', 'Bob', 'Carol', 'Dave', 'Eve', 'Frank', 'Grace', 'Heidi', 'Ivan', 'Judy', 'Mallory', 'Oscar']
+
+SCENARIOS = {
+    'unsorted': ([], {}),
+    'sorted by name': ([{'colId': 'name', 'sort': 'asc'}], {}),
+    'sorted by age desc': ([{'colId': 'age', 'sort': 'desc'}], {}),
+    'age in range': ([], {'age': {'filterType': 'number', 'type': 'inRange', 'filter': 30, 'filterTo': 40}}),
+    'name starts with, by age': ([{'colId': 'age', 'sort': 'asc'}],
+                                 {'name': {'filterType': 'text', 'type': 'startsWith', 'filter': 'gra'}}),
+}
+
+with tempfile.TemporaryDirectory() as directory:
+    source = SqliteRowSource(str(Path(directory) / 'benchmark.sqlite3'), 'people',
+                             {'name': 'TEXT COLLATE NOCASE', 'age': 'INTEGER'}, indexed=['name', 'age'])
+    t = perf_counter()
+    source.seed((f'{random.choice(NAMES)} {i}', random.randint(18, 99)) for i in range(ROWS))
+    print(f'Seeded {ROWS:,} rows in {perf_counter() - t:.1f} s\n')
+
+    for name, (sort_model, filter_model) in SCENARIOS.items():
+        t = perf_counter()
+        _, count = source.query(0, BLOCK, sort_model, filter_model)
+        first = (perf_counter() - t) * 1000
+        latencies = []
+        for _ in range(SAMPLES):
+            start = random.randrange(0, max(count - BLOCK, 1))
+            t = perf_counter()
+            source.query(start, start + BLOCK, sort_model, filter_model)
+            latencies.append((perf_counter() - t) * 1000)
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        verdict = 'ok' if p99 <= TARGET_P99_MS else f'above {TARGET_P99_MS} ms target'
+        print(f'{name:<26} {count:>9,} rows   first {first:6.1f} ms   '
+              f'p50 {p50:6.1f} ms   p99 {p99:6.1f} ms   {verdict}')
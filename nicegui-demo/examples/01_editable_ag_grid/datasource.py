@@ -0,0 +1,246 @@
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from nicegui import app, run, ui
+
+TEXT_FILTERS = {
+    'equals': ('{} = ?', '{}'),
+    'notEqual': ('{} != ?', '{}'),
+    'contains': ("{} LIKE ? ESCAPE '\\'", '%{}%'),
+    'notContains': ("{} NOT LIKE ? ESCAPE '\\'", '%{}%'),
+    'startsWith': ("{} LIKE ? ESCAPE '\\'", '{}%'),
+    'endsWith': ("{} LIKE ? ESCAPE '\\'", '%{}'),
+}
+NUMBER_FILTERS = {
+    'equals': '{} = ?',
+    'notEqual': '{} != ?',
+    'lessThan': '{} < ?',
+    'lessThanOrEqual': '{} <= ?',
+    'greaterThan': '{} > ?',
+    'greaterThanOrEqual': '{} >= ?',
+}
+
+Block = Tuple[List[Dict[str, Any]], int]
+
+
+class SqliteRowSource:
+    """Rows of one SQLite table, answered in blocks for AG Grid's infinite row model.
+
+    Sorting and filtering run in SQLite on indexed columns. Pages are found through the index only
+    (``SELECT id ... LIMIT/OFFSET``) before the full rows are read; the ordered ids of filtered results
+    and the answered blocks are kept in LRU caches until the table changes.
+    """
+
+    def __init__(self, path: str, table: str, columns: Dict[str, str], *,
+                 indexed: Iterable[str] = (), cache_blocks: int = 512) -> None:
+        self.path = path
+        self.table = table
+        self.columns = {'id': 'INTEGER PRIMARY KEY', **columns}
+        self.route = f'/api/rows/{table}'
+        self.indexed = set(indexed)
+        self.cache_blocks = cache_blocks
+        self._blocks: OrderedDict[str, Block] = OrderedDict()
+        self._orderings: OrderedDict[str, List[int]] = OrderedDict()
+        self._count: Optional[int] = None
+        self._lock = threading.Lock()  # queries run in several threads at once
+        self._generation = 0  # bumped on every write, so results read before it are not cached
+        self._local = threading.local()
+        with self._connection() as db:
+            db.execute(f'CREATE TABLE IF NOT EXISTS {table} '
+                       f'({", ".join(f"{name} {type_}" for name, type_ in self.columns.items())})')
+            for name in indexed:
+                db.execute(f'CREATE INDEX IF NOT EXISTS {table}_{name} ON {table} ({name}, id)')
+        app.add_api_route(self.route, self._endpoint, methods=['GET'])
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, since queries run in NiceGUI's thread pool."""
+        if not hasattr(self._local, 'db'):
+            self._local.db = sqlite3.connect(self.path)
+            self._local.db.row_factory = sqlite3.Row
+            self._local.db.execute('PRAGMA journal_mode=WAL')
+            self._local.db.execute('PRAGMA cache_size=-65536')  # 64 MiB
+            self._local.db.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+        return self._local.db
+
+    def __len__(self) -> int:
+        return self._connection().execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def seed(self, rows: Iterable[Tuple]) -> None:
+        """Insert rows (tuples in column order, without id) in a single transaction."""
+        names = [name for name in self.columns if name != 'id']
+        with self._connection() as db:
+            db.executemany(f'INSERT INTO {self.table} ({", ".join(names)}) VALUES ({", ".join("?" * len(names))})',
+                           rows)
+        self._invalidate()
+
+    def query(self, start: int, end: int,
+              sort_model: List[Dict[str, str]], filter_model: Dict[str, Dict]) -> Block:
+        """Rows ``start`` to ``end`` of the sorted and filtered table, plus the filtered row count."""
+        where, params = self._where(filter_model)
+        order = self._order(sort_model, filter_model)
+        generation = self._generation  # a write while the query runs makes its result stale
+        db = self._connection()
+        if filter_model:
+            # a filtered result has to be collected anyway, so its ordered ids are kept and sliced for every block
+            key = json.dumps([order, filter_model], sort_keys=True)
+            with self._lock:
+                ordering = self._orderings.get(key)
+            if ordering is None:
+                ordering = [r[0] for r in db.execute(f'SELECT id FROM {self.table}{where} ORDER BY {order}', params)]
+            with self._lock:
+                if generation == self._generation:
+                    self._orderings[key] = ordering
+                    self._orderings.move_to_end(key)
+                    if len(self._orderings) > 8:
+                        self._orderings.popitem(last=False)
+            ids, count = ordering[start:end], len(ordering)
+        else:
+            # the index walks to the offset, only the ids of one block are read from it
+            ids = [r[0] for r in db.execute(f'SELECT id FROM {self.table} ORDER BY {order} LIMIT ? OFFSET ?',
+                                            [end - start, start])]
+            count = self._count
+            if count is None:
+                count = len(self)
+                with self._lock:
+                    if generation == self._generation:
+                        self._count = count
+        by_id = {r['id']: dict(r) for r in db.execute(
+            f'SELECT * FROM {self.table} WHERE id IN ({", ".join("?" * len(ids))})', ids)}
+        return [by_id[id_] for id_ in ids], count
+
+    def _order(self, sort_model: List[Dict[str, str]], filter_model: Dict[str, Dict]) -> str:
+        if not sort_model:  # any stable order will do, so follow the index of a filtered column if there is one
+            sort_model = [{'colId': name, 'sort': 'asc'} for name in filter_model if name in self.indexed][:1]
+        order = [f'{self._column(s["colId"])} {"DESC" if s["sort"] == "desc" else "ASC"}' for s in sort_model]
+        # ties are broken by id, in the same direction so that the (column, id) index can be used backwards
+        order.append('id DESC' if sort_model and sort_model[-1]['sort'] == 'desc' else 'id ASC')
+        return ', '.join(order)
+
+    async def get_rows(self, start: int, end: int,
+                       sort_model: List[Dict[str, str]], filter_model: Dict[str, Dict]) -> Block:
+        """Cached ``query`` that runs off the event loop."""
+        key = json.dumps([start, end, sort_model, filter_model], sort_keys=True)
+        if key in self._blocks:
+            self._blocks.move_to_end(key)
+            return self._blocks[key]
+        generation = self._generation
+        block = await run.io_bound(self.query, start, end, sort_model, filter_model)
+        if generation != self._generation:
+            return block
+        self._blocks[key] = block
+        if len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+    def add(self, **values: Any) -> Dict[str, Any]:
+        with self._connection() as db:
+            names = [self._column(name) for name in values]
+            cursor = db.execute(f'INSERT INTO {self.table} ({", ".join(names)}) '
+                                f'VALUES ({", ".join("?" * len(names))})', list(values.values()))
+        self._invalidate()
+        return {'id': cursor.lastrowid, **values}
+
+    def update(self, row: Dict[str, Any]) -> None:
+        changes = {self._column(name): value for name, value in row.items() if name != 'id'}
+        with self._connection() as db:
+            db.execute(f'UPDATE {self.table} SET {", ".join(f"{name} = ?" for name in changes)} WHERE id = ?',
+                       [*changes.values(), row['id']])
+        self._invalidate()
+
+    def delete(self, ids: List[int]) -> None:
+        with self._connection() as db:
+            db.execute(f'DELETE FROM {self.table} WHERE id IN ({", ".join("?" * len(ids))})', ids)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._blocks.clear()
+        with self._lock:  # queries check the generation under the lock before they store what they read
+            self._generation += 1
+            self._orderings.clear()
+            self._count = None
+
+    def _column(self, name: str) -> str:
+        if name not in self.columns:  # never put unknown names into SQL
+            raise HTTPException(400, f'unknown column {name}')
+        return name
+
+    def _where(self, filter_model: Dict[str, Dict]) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for name, model in filter_model.items():
+            clause, clause_params = self._condition(self._column(name), model)
+            clauses.append(clause)
+            params += clause_params
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def _condition(self, column: str, model: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        if 'conditions' in model:  # two conditions combined with AND/OR
+            parts = [self._condition(column, {'filterType': model['filterType'], **c}) for c in model['conditions']]
+            operator = ' OR ' if model.get('operator') == 'OR' else ' AND '
+            return '(' + operator.join(p[0] for p in parts) + ')', [v for p in parts for v in p[1]]
+        type_ = model.get('type')
+        if type_ == 'blank':
+            return f'{column} IS NULL', []
+        if type_ == 'notBlank':
+            return f'{column} IS NOT NULL', []
+        if model.get('filterType') == 'number':
+            if type_ == 'inRange':
+                return f'{column} BETWEEN ? AND ?', [model['filter'], model['filterTo']]
+            if type_ in NUMBER_FILTERS:
+                return NUMBER_FILTERS[type_].format(column), [model['filter']]
+        elif type_ in TEXT_FILTERS:
+            sql, pattern = TEXT_FILTERS[type_]
+            value = str(model['filter']).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            return sql.format(column), [pattern.format(value) if 'LIKE' in sql else model['filter']]
+        raise HTTPException(400, f'unsupported filter {model}')
+
+    async def _endpoint(self, start: int, end: int, sort: str = '[]', filter: str = '{}') -> Dict[str, Any]:  # pylint: disable=redefined-builtin
+        rows, count = await self.get_rows(start, min(end, start + 1000), json.loads(sort), json.loads(filter))
+        return {'rows': rows, 'lastRow': count}
+
+
+class ServerSideGrid(ui.aggrid):
+
+    def __init__(self, source: SqliteRowSource, options: Dict, *, block_size: int = 100, **kwargs: Any) -> None:
+        """AG Grid backed by a row source on the server
+
+        Uses AG Grid's infinite row model (the server-side row model is an AG Grid Enterprise feature):
+        the browser only asks for the blocks it scrolls to, including the current sort and filter model,
+        and the rows never become part of the page options.
+
+        :param source: rows shown in the grid
+        :param options: AG Grid options without ``rowData``
+        :param block_size: number of rows the grid asks for at once
+        """
+        super().__init__({
+            **options,
+            'rowModelType': 'infinite',
+            'cacheBlockSize': block_size,
+            'maxBlocksInCache': 50,
+            ':getRowId': '(params) => String(params.data.id)',
+            'datasource': {':getRows': _GET_ROWS.replace('ROUTE', source.route)},
+        }, **kwargs)
+        self.source = source
+
+    def refresh(self) -> None:
+        """Let the grid ask for its blocks again, e.g. after rows were added or removed."""
+        self.run_grid_method('refreshInfiniteCache')
+
+
+_GET_ROWS = '''(params) => {
+    const query = new URLSearchParams({
+        start: params.startRow,
+        end: params.endRow,
+        sort: JSON.stringify(params.sortModel),
+        filter: JSON.stringify(params.filterModel),
+    });
+    fetch(window.path_prefix + 'ROUTE?' + query)
+        .then((response) => response.json())
+        .then((data) => params.successCallback(data.rows, data.lastRow))
+        .catch(() => params.failCallback());
+}'''
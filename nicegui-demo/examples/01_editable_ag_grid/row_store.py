@@ -0,0 +1,61 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from nicegui import ui
+
+
+class RowStore:
+    """Rows indexed by their id, with a running next id so adding a row never scans the table."""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]] = ()) -> None:
+        self.rows: Dict[int, Dict[str, Any]] = {row['id']: row for row in rows}
+        self.next_id = max(self.rows, default=-1) + 1
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, **values: Any) -> Dict[str, Any]:
+        row = {'id': self.next_id, **values}
+        self.rows[row['id']] = row
+        self.next_id += 1
+        return row
+
+    def update(self, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Merge `changes` into the row with the same id (in place, so every view of the row sees it)."""
+        row = self.rows.get(changes['id'])
+        if row is not None:
+            row.update(changes)
+        return row
+
+    def remove(self, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        return [row for row in (self.rows.pop(id_, None) for id_ in ids) if row is not None]
+
+
+class TransactionGrid(ui.aggrid):
+
+    def __init__(self, store: RowStore, options: Dict, **kwargs: Any) -> None:
+        """AG Grid kept in sync with row transactions
+
+        Rows are identified by their id, so adding and removing rows sends only those rows
+        (an AG Grid ``applyTransaction``) instead of the whole ``rowData``.
+        Cell edits are already shown by the browser and only need to be applied to the store.
+        A full ``update()``, e.g. after changing the options, takes the rows from the store again.
+
+        :param store: rows shown in the grid
+        :param options: AG Grid options without ``rowData``
+        """
+        super().__init__({
+            **options,
+            'rowData': list(store.rows.values()),
+            ':getRowId': '(params) => String(params.data.id)',
+        }, **kwargs)
+        self.store = store
+
+    def update(self) -> None:
+        self.options['rowData'] = list(self.store.rows.values())  # transactions do not change the options
+        super().update()
+
+    def add_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self.run_grid_method('applyTransaction', {'add': rows})
+
+    def remove_rows(self, ids: Iterable[int]) -> None:
+        self.run_grid_method('applyTransaction', {'remove': [{'id': id_} for id_ in ids]})
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import random
+
+from datasource import ServerSideGrid, SqliteRowSource
+
+from nicegui import ui
+
+ROWS = 1_000_000
+NAMES = ['Alice', 'Bob', 'Carol', 'Dave', 'Eve', 'Frank', 'Grace', 'Heidi', 'Ivan', 'Judy', 'Mallory', 'Oscar']
+
+columns = [
+    {'field': 'name', 'editable': True, 'sortable': True, 'filter': 'agTextColumnFilter'},
+    {'field': 'age', 'editable': True, 'sortable': True, 'filter': 'agNumberColumnFilter'},
+    {'field': 'id'},
+]
+rows = SqliteRowSource('rows.sqlite3', 'people', {'name': 'TEXT COLLATE NOCASE', 'age': 'INTEGER'},
+                       indexed=['name', 'age'])
+if not len(rows):  # the first start creates a table large enough to feel the difference
+    rows.seed((f'{random.choice(NAMES)} {i}', random.randint(18, 99)) for i in range(ROWS))
+
+
+@ui.page('/')
+def page():
+    def add_row():
+        row = rows.add(name='New name', age=None)
+        ui.notify(f'Added row with ID {row["id"]}')
+        aggrid.refresh()
+
+    def handle_cell_value_change(e):
+        new_row = e.args['data']
+        ui.notify(f'Updated row to: {e.args["data"]}')
+        rows.update(new_row)
+
+    async def delete_selected():
+        selected_id = [row['id'] for row in await aggrid.get_selected_rows()]
+        rows.delete(selected_id)
+        ui.notify(f'Deleted row with ID {selected_id}')
+        aggrid.refresh()
+
+    aggrid = ServerSideGrid(rows, {
+        'columnDefs': columns,
+        'rowSelection': 'multiple',
+        'stopEditingWhenCellsLoseFocus': True,
+    }).classes('h-[600px]').on('cellValueChanged', handle_cell_value_change)
+
+    ui.button('Delete selected', on_click=delete_selected)
+    ui.button('New row', on_click=add_row)
+
+
+ui.run()
@@ -1,24 +1,47 @@
 import { loadResource } from "../../static/utils/resources.js";
 
+const DATE_PROPS = ["start", "end", "allDay"];
+const EVENT_PROPS = ["title", "url", "classNames", "editable", "display", "color", "backgroundColor", "borderColor", "textColor"];
+
 export default {
   template: "<div></div>",
   props: {
-    options: Array,
+    options: Object,
+    events: Object,
+    events_url: String,
     resource_path: String,
   },
   async mounted() {
     await this.$nextTick(); // NOTE: wait for window.path_prefix to be set
     await loadResource(window.path_prefix + `${this.resource_path}/index.global.min.js`);
     this.options.eventClick = (info) => this.$emit("click", { info });
+    this.options.eventSources = [
+      this.events_url
+        ? { id: "server", url: window.path_prefix + this.events_url } // fetched per visible date range
+        : { id: "server", events: Object.values(this.events) },
+    ];
     this.calendar = new FullCalendar.Calendar(this.$el, this.options);
     this.calendar.render();
   },
   methods: {
-    update_calendar() {
-      if (this.calendar) {
-        this.calendar.setOption("events", this.options.events);
-        this.calendar.render();
+    add_events(events) {
+      const source = this.calendar?.getEventSourceById("server");
+      this.calendar?.batchRendering(() => events.forEach((event) => this.calendar.addEvent(event, source)));
+    },
+    update_event(id, changes) {
+      const event = this.calendar?.getEventById(id);
+      if (!event) return;
+      if (DATE_PROPS.some((key) => key in changes)) {
+        const allDay = "allDay" in changes ? changes.allDay : event.allDay;
+        event.setDates(changes.start ?? event.start, changes.end ?? event.end, { allDay });
       }
+      for (const [key, value] of Object.entries(changes)) {
+        if (EVENT_PROPS.includes(key)) event.setProp(key, value);
+        else if (!DATE_PROPS.includes(key)) event.setExtendedProp(key, value);
+      }
+    },
+    remove_event(id) {
+      this.calendar?.getEventById(id)?.remove();
     },
   },
 };
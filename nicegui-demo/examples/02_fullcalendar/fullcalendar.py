@@ -1,56 +1,207 @@
+import json
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+from fastapi.responses import Response
+
+from nicegui import app
 from nicegui.element import Element
 from nicegui.events import handle_event
 
 
+def timestamp(value: str) -> float:
+    """Seconds of an ISO date or date-time; times without an offset are local, like FullCalendar's "local" time zone."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+class IntervalIndex:
+    """Ids of the intervals that overlap a range.
+
+    Intervals are kept sorted by start, so a query bisects to the first one that can still overlap the range:
+    the one starting at most `max_length` earlier. Longer intervals, which are rare in a calendar,
+    are kept in a separate list that every query scans.
+    """
+
+    def __init__(self, max_length: float = 2 * 86400) -> None:
+        self.max_length = max_length
+        self.keys: List[Tuple[float, str]] = []  # (start, id), sorted
+        self.intervals: Dict[str, Tuple[float, float]] = {}
+        self.long: Dict[str, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def add(self, id_: str, start: float, end: float) -> None:
+        self.remove(id_)
+        self.intervals[id_] = (start, end)
+        if end - start > self.max_length:
+            self.long[id_] = (start, end)
+        else:
+            insort(self.keys, (start, id_))
+
+    def add_many(self, intervals: Iterable[Tuple[str, float, float]]) -> None:
+        """Add new intervals with a single sort instead of one insertion each."""
+        for id_, start, end in intervals:
+            self.intervals[id_] = (start, end)
+            if end - start > self.max_length:
+                self.long[id_] = (start, end)
+            else:
+                self.keys.append((start, id_))
+        self.keys.sort()
+
+    def remove(self, id_: str) -> None:
+        interval = self.intervals.pop(id_, None)
+        if interval is None:
+            return
+        if self.long.pop(id_, None) is None:
+            del self.keys[bisect_left(self.keys, (interval[0], id_))]
+
+    def overlapping(self, start: float, end: float) -> List[str]:
+        first = bisect_left(self.keys, (start - self.max_length,))
+        last = bisect_right(self.keys, (end,))  # ties sort after (end,), so intervals starting at `end` are left out
+        ids = [id_ for _, id_ in self.keys[first:last] if self.intervals[id_][1] > start]
+        ids += [id_ for id_, (s, e) in self.long.items() if s < end and e > start]
+        return ids
+
+
+class EventSource:
+    """Events kept on the server and sent to FullCalendar only for the date range it shows.
+
+    The calendar fetches the visible range from a JSON route whenever the user navigates,
+    and the route answers it from an interval index instead of scanning all events.
+    """
+
+    _count = 0
+
+    def __init__(self, events: Iterable[Dict[str, Any]] = ()) -> None:
+        EventSource._count += 1
+        self.route = f'/api/fullcalendar/{EventSource._count}'
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.index = IntervalIndex()
+        self._next_id = 0
+        self.index.add_many(self._interval(self._with_id(event)) for event in events)
+        app.add_api_route(self.route, self._endpoint, methods=['GET'])
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def add(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Add an event; it gets an id unless it has one."""
+        event = self._with_id(event)
+        self.index.add(*self._interval(event))
+        return event
+
+    def update(self, event_id: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        event = self.events[event_id]
+        event.update(changes)
+        self.index.add(*self._interval(event))
+        return event
+
+    def remove(self, event_id: str) -> None:
+        self.events.pop(event_id, None)
+        self.index.remove(event_id)
+
+    def query(self, start: str, end: str) -> List[Dict[str, Any]]:
+        return [self.events[id_] for id_ in self.index.overlapping(timestamp(start), timestamp(end))]
+
+    def _with_id(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        if 'id' not in event:
+            event = {'id': str(self._next_id), **event}
+            self._next_id += 1
+        self.events[event['id']] = event
+        return event
+
+    @staticmethod
+    def _interval(event: Dict[str, Any]) -> Tuple[str, float, float]:
+        start = timestamp(event['start'])
+        if event.get('end'):
+            end = timestamp(event['end'])
+        else:  # FullCalendar's default durations
+            end = start + (86400 if len(event['start']) == 10 else 3600)
+        return event['id'], start, end
+
+    def _endpoint(self, start: str, end: str) -> Response:
+        # the events are plain JSON already, FastAPI's encoder would only walk them once more
+        return Response(json.dumps(self.query(start, end)), media_type='application/json')
+
+
 class FullCalendar(Element, component='fullcalendar.js'):
 
-    def __init__(self, options: Dict[str, Any], on_click: Optional[Callable] = None) -> None:
+    def __init__(self, options: Dict[str, Any], on_click: Optional[Callable] = None, *,
+                 source: Optional[EventSource] = None) -> None:
         """FullCalendar
 
         An element that integrates the FullCalendar library (https://fullcalendar.io/) to create an interactive calendar display.
         For an example of the FullCalendar library with plugins see https://github.com/dorel14/NiceGui-FullCalendar_more_Options
 
+        Events are identified by their id (one is assigned if missing).
+        Adding, updating and removing an event only sends that change to the browser.
+
         :param options: dictionary of FullCalendar properties for customization, such as "initialView", "slotMinTime", "slotMaxTime", "allDaySlot", "timeZone", "height", and "events".
         :param on_click: callback that is called when a calendar event is clicked.
+        :param source: server-side events to fetch per visible date range instead of sending "events" with the options
         """
         super().__init__()
         self.add_resource(Path(__file__).parent / 'lib')
-        self._props['options'] = options
+        self.source = source
+        self._next_id = 0
+        self._events: Dict[str, Dict[str, Any]] = {}
+        for event in options.get('events', []):
+            self._store(event)
+        # the events are sent as a dictionary by id, so that a change never has to search or resend the list
+        self._props['options'] = {key: value for key, value in options.items() if key != 'events'}
+        self._props['events'] = self._events
+        self._props['events_url'] = source.route if source else None
 
         if on_click:
             self.on('click', lambda e: handle_event(on_click, e))
 
-    def add_event(self, title: str, start: str, end: str, **kwargs) -> None:
+    def _store(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        if self.source is not None:
+            return self.source.add(event)
+        if 'id' not in event:
+            event = {'id': f'event-{self._next_id}', **event}
+            self._next_id += 1
+        self._events[event['id']] = event
+        return event
+
+    def add_event(self, title: str, start: str, end: str, **kwargs) -> str:
         """Add an event to the calendar.
 
         :param title: title of the event
         :param start: start time of the event
         :param end: end time of the event
+        :return: id of the event
         """
-        event_dict = {'title': title, 'start': start, 'end': end, **kwargs}
-        self._props['options']['events'].append(event_dict)
-        self.update()
-        self.run_method('update_calendar')
+        event = self._store({'title': title, 'start': start, 'end': end, **kwargs})
+        self.run_method('add_events', [event])
+        return event['id']
 
-    def remove_event(self, title: str, start: str, end: str) -> None:
-        """Remove an event from the calendar.
+    def update_event(self, event_id: str, **changes: Any) -> None:
+        """Change properties of an event, e.g. its title, start, end or color.
 
-        :param title: title of the event
-        :param start: start time of the event
-        :param end: end time of the event
+        :param event_id: id of the event
         """
-        for event in self._props['options']['events']:
-            if event['title'] == title and event['start'] == start and event['end'] == end:
-                self._props['options']['events'].remove(event)
-                break
+        if self.source is not None:
+            self.source.update(event_id, changes)
+        else:
+            self._events[event_id].update(changes)
+        self.run_method('update_event', event_id, changes)
+
+    def remove_event(self, event_id: str) -> None:
+        """Remove an event from the calendar.
 
-        self.update()
-        self.run_method('update_calendar')
+        :param event_id: id of the event
+        """
+        if self.source is not None:
+            self.source.remove(event_id)
+        else:
+            self._events.pop(event_id, None)
+        self.run_method('remove_event', event_id)
 
     @property
     def events(self) -> List[Dict]:
-        """List of events currently displayed in the calendar."""
-        return self._props['options']['events']
+        """List of events of the calendar (all of them, also those of a source outside the visible range)."""
+        return list((self.source.events if self.source is not None else self._events).values())
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
-from datetime import datetime
+import os
+import random
+from datetime import datetime, timedelta
 
+from fullcalendar import EventSource
 from fullcalendar import FullCalendar as fullcalendar
 
 from nicegui import events, ui
@@ -44,11 +47,27 @@ options = {
 }
 
 
+def random_events(count: int):
+    """Hour-long lessons spread over three years around today."""
+    today = datetime.now().replace(minute=0, second=0, microsecond=0)
+    for _ in range(count):
+        start = today + timedelta(days=random.randint(-540, 540), hours=random.randint(-3, 8))
+        yield {
+            'title': random.choice(['Math', 'Physics', 'Chemistry', 'Biology']),
+            'start': start.strftime(r'%Y-%m-%d %H:%M:%S'),
+            'end': (start + timedelta(hours=1)).strftime(r'%Y-%m-%d %H:%M:%S'),
+        }
+
+
+# the browser fetches only the events of the month on screen; try CALENDAR_EVENTS=100000
+source = EventSource([*options.pop('events'), *random_events(int(os.environ.get('CALENDAR_EVENTS', 0)))])
+
+
 def handle_click(event: events.GenericEventArguments):
     if 'info' in event.args:
         ui.notify(event.args['info']['event'])
 
 
-fullcalendar(options, on_click=handle_click)
+fullcalendar(options, on_click=handle_click, source=source)
 
 ui.run()
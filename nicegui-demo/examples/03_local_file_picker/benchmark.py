@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Query latency of the file index over a synthetic tree.
+
+Run with `uv run benchmark.py [paths]`; no files are created, the paths are generated in memory.
+Every query should stay under the 10 ms target; substring and fuzzy matching are cut off by the time budget
+of the search, prefix queries are answered by bisection.
+"""
+import random
+import statistics
+import sys
+from time import perf_counter
+
+from file_index import _Snapshot
+
+PATHS = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+TARGET_MS = 10
+WORDS = ['src', 'lib', 'test', 'docs', 'build', 'main', 'utils', 'config', 'assets', 'images', 'data', 'models',
+         'views', 'local', 'file', 'picker', 'index', 'search', 'core', 'node_modules']
+QUERIES = {
+    'prefix': ['file_12', 'main', 'f', 'index_9'],
+    'substring': ['picker', 'le_99', 'utils3', 'zzzq', 'le_99/', 'src1/zz'],
+    'fuzzy': ['ndx', 'lfpk', 'mnut', 'qqqq'],
+}
+
+random.seed(0)
+paths = []
+for i in range(PATHS):
+    folders = '/'.join(f'{random.choice(WORDS)}{random.randint(0, 50)}' for _ in range(random.randint(1, 6)))
+    paths.append((f'{folders}/file_{i}.{random.choice(["py", "js", "txt", "md"])}', False))
+t = perf_counter()
+snapshot = _Snapshot(paths)
+print(f'Indexed {PATHS:,} paths ({len(snapshot.blob) / 1e6:.1f} MB) in {perf_counter() - t:.2f} s\n')
+
+for kind, queries in QUERIES.items():
+    latencies = []
+    for query in queries:
+        for _ in range(20):
+            t = perf_counter()
+            snapshot.search(query, 200)
+            latencies.append((perf_counter() - t) * 1000)
+    p50 = statistics.median(latencies)
+    worst = max(latencies)
+    verdict = 'ok' if worst <= TARGET_MS else f'above {TARGET_MS} ms target'
+    print(f'{kind:<10} p50 {p50:6.2f} ms   max {worst:6.2f} ms   {verdict}')
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import re
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from nicegui import background_tasks, run
+
+
+def _bit_table() -> np.ndarray:
+    """Map every byte to one of 64 bits: letters, digits and separators get their own bit, the rest share."""
+    table = np.zeros(256, dtype=np.uint64)
+    for byte in range(256):
+        char = chr(byte).lower()
+        position = '0123456789abcdefghijklmnopqrstuvwxyz._-/ '.find(char)
+        table[byte] = np.uint64(1) << np.uint64(position if position >= 0 else 41 + byte % 23)
+    return table
+
+
+BITS = _bit_table()
+SCAN_WINDOW = 1 << 20  # characters searched between two looks at the clock
+
+
+class _Snapshot:
+    """Immutable search structures for a list of relative paths.
+
+    All paths live in one newline-separated string (plus a lower-case copy) and an array of offsets,
+    so a substring query is a single ``str.find`` scan in C. Basenames are kept sorted for prefix queries
+    with bisect, and a 64-bit mask of the characters in each path rules out most paths of a fuzzy query
+    before a regular expression looks at the rest.
+    """
+
+    def __init__(self, paths: List[Tuple[str, bool]]) -> None:
+        paths.sort()
+        names = [path.rsplit('/', 1)[-1].lower() for path, _ in paths]
+        self.blob = '\n'.join(path for path, _ in paths) + '\n'
+        self.lower_blob = self.blob.lower()
+        self.offsets = self._offsets(path for path, _ in paths)
+        self.ends = np.append(self.offsets[1:], len(self.blob)) - 1
+        self.names_blob = '\n'.join(names) + '\n'  # a third of the size, for queries without a "/"
+        self.name_offsets = self._offsets(names)
+        self.is_dir = bytearray(is_dir for _, is_dir in paths)
+        order = sorted(range(len(paths)), key=names.__getitem__)
+        self.basenames = [names[i] for i in order]
+        self.basename_order = array('L', order)
+        encoded = np.frombuffer(self.lower_blob.encode(), dtype=np.uint8)
+        line_starts = np.concatenate(([0], np.flatnonzero(encoded == ord('\n'))[:-1] + 1)).astype(np.int64)
+        self.masks = np.bitwise_or.reduceat(BITS[encoded], line_starts) if paths else np.zeros(0, dtype=np.uint64)
+
+    @staticmethod
+    def _offsets(lines: Iterable[str]) -> np.ndarray:
+        lengths = np.fromiter((len(line) + 1 for line in lines), dtype=np.int64)
+        return np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def path(self, index: int) -> str:
+        start = int(self.offsets[index])
+        return self.blob[start:self.blob.index('\n', start)]
+
+    def search(self, query: str, limit: int, budget: float = 0.006) -> List[int]:
+        """Indices of matching paths: basename prefix matches first, then substring, then fuzzy matches.
+
+        Substring and fuzzy matching stop once `budget` seconds have passed,
+        so a rare match in a very large tree returns what was found so far.
+        """
+        deadline = time.perf_counter() + budget
+        query = query.strip().lower()
+        if not query:
+            return []
+        found: Dict[int, None] = {}  # an ordered set
+        position = bisect_left(self.basenames, query)
+        while position < len(self.basenames) and self.basenames[position].startswith(query) and len(found) < limit:
+            found[self.basename_order[position]] = None
+            position += 1
+
+        blob, offsets = (self.lower_blob, self.offsets) if '/' in query else (self.names_blob, self.name_offsets)
+        position = 0
+        while position < len(blob) and len(found) < limit and time.perf_counter() < deadline:
+            # windows of about a millisecond of str.find each; they overlap, so no match is cut in two
+            start = blob.find(query, position, position + SCAN_WINDOW + len(query))
+            if start < 0:
+                position += SCAN_WINDOW
+                continue
+            found[int(np.searchsorted(offsets, start, side='right')) - 1] = None
+            position = blob.index('\n', start)
+
+        letters = [c for c in query if not c.isspace()]
+        if len(found) < limit and len(letters) > 1 and time.perf_counter() < deadline:
+            # every character in order, within one path, e.g. "lfpk" finds "local_file_picker.py"
+            mask = np.bitwise_or.reduce(BITS[np.frombuffer(''.join(letters).encode(), dtype=np.uint8)])
+            pattern = re.compile('[^\n]*?'.join(re.escape(c) for c in letters))
+            candidates = np.flatnonzero((self.masks & mask) == mask)
+            for chunk in range(0, len(candidates), 128):
+                if len(found) >= limit or time.perf_counter() > deadline:
+                    break
+                indices = candidates[chunk:chunk + 128]
+                starts, ends = self.offsets[indices].tolist(), self.ends[indices].tolist()
+                for index, start, end in zip(indices.tolist(), starts, ends):
+                    if pattern.search(self.lower_blob, start, end) and index not in found:
+                        found[index] = None
+                        if len(found) >= limit:
+                            break
+        return list(found)[:limit]
+
+
+class FileIndex:
+    """All paths under a root directory, crawled in the background and searchable without touching the disk.
+
+    After the first crawl the index is refreshed incrementally: one stat per known directory,
+    and only directories whose mtime changed are scanned again.
+    Refreshing stops once the last picker that started the index has stopped it; the snapshot is kept for the next one.
+    """
+
+    _indexes: Dict[Tuple[str, bool], 'FileIndex'] = {}
+
+    @classmethod
+    def for_directory(cls, root: str, show_hidden_files: bool = False) -> 'FileIndex':
+        """Shared index of `root`, so every picker on the same directory uses one background worker."""
+        key = (os.path.abspath(os.path.expanduser(root)), show_hidden_files)
+        if key not in cls._indexes:
+            cls._indexes[key] = cls(*key)
+        return cls._indexes[key]
+
+    def __init__(self, root: str, show_hidden_files: bool = False, *, refresh_interval: float = 60.0) -> None:
+        self.root = root
+        self.show_hidden_files = show_hidden_files
+        self.refresh_interval = refresh_interval
+        self.snapshot = _Snapshot([])
+        self.ready = asyncio.Event()
+        # relative directory -> (mtime, relative paths of its files, relative paths of its subdirectories)
+        self._dirs: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._users = 0
+
+    def start(self) -> None:
+        """Keep the index fresh until `stop` is called as often as `start`."""
+        self._users += 1
+        if self._task is None:
+            self._task = background_tasks.create(self._run(), name=f'index {self.root}')
+
+    def stop(self) -> None:
+        self._users -= 1
+
+    async def _run(self) -> None:
+        # the task is not cancelled, since a crawl that is still running in its thread would race with the next one
+        while True:
+            await run.io_bound(self.refresh)
+            self.ready.set()
+            await asyncio.sleep(self.refresh_interval)
+            if not self._users:  # no await until the task is gone, so a picker opened meanwhile starts a new one
+                self._task = None
+                return
+
+    async def search(self, query: str, limit: int = 200) -> List[Tuple[str, bool]]:
+        """Absolute paths and folder flags of the best matches."""
+        snapshot = self.snapshot
+        indices = await run.io_bound(snapshot.search, query, limit)
+        return [(os.path.join(self.root, snapshot.path(i)), bool(snapshot.is_dir[i])) for i in indices or []]
+
+    def refresh(self) -> None:
+        """Crawl new and changed directories, then publish a new snapshot if anything changed (runs in a thread)."""
+        changed = not self._dirs
+        if changed:
+            self._scan('')
+        for directory in list(self._dirs):
+            if directory not in self._dirs:  # dropped together with its parent
+                continue
+            try:
+                mtime = os.stat(os.path.join(self.root, directory)).st_mtime_ns
+            except OSError:
+                self._drop(directory)
+                changed = True
+                continue
+            if mtime != self._dirs[directory][0]:
+                self._scan(directory)
+                changed = True
+        if changed:
+            paths = [(path, False) for _, files, _ in self._dirs.values() for path in files]
+            paths += [(path, True) for path in self._dirs if path]
+            self.snapshot = _Snapshot(paths)
+
+    def _scan(self, directory: str) -> None:
+        """Scan `directory`, crawl its new subdirectories and drop the ones that disappeared."""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            absolute = os.path.join(self.root, current)
+            files: List[str] = []
+            subdirs: List[str] = []
+            try:
+                mtime = os.stat(absolute).st_mtime_ns
+                with os.scandir(absolute) as it:
+                    for entry in it:
+                        if not self.show_hidden_files and entry.name.startswith('.'):
+                            continue
+                        path = f'{current}/{entry.name}' if current else entry.name
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)  # never follow links into cycles
+                        except OSError:
+                            continue
+                        (subdirs if is_dir else files).append(path)
+            except OSError:
+                continue
+            for old in self._dirs.get(current, (0, [], []))[2]:
+                if old not in subdirs:
+                    self._drop(old)
+            self._dirs[current] = (mtime, files, subdirs)
+            stack.extend(path for path in subdirs if path not in self._dirs)
+
+    def _drop(self, directory: str) -> None:
+        _, _, subdirs = self._dirs.pop(directory, (0, [], []))
+        for subdir in subdirs:
+            self._drop(subdir)
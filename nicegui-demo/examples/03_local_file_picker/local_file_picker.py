@@ -1,14 +1,64 @@
+import html
+import math
+import os
 import platform
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
-from nicegui import events, ui
+from file_index import FileIndex
+
+from nicegui import background_tasks, events, run, ui
+
+# directory listings shared by all pickers: (path, show_hidden) -> (mtime of the directory, rows)
+_listings: OrderedDict[Tuple[str, bool], Tuple[int, List[Dict]]] = OrderedDict()
+_listings_lock = threading.Lock()
+MAX_CACHED_LISTINGS = 64
+
+
+def list_directory(path: str, show_hidden_files: bool) -> List[Dict]:
+    """Grid rows for a directory, sorted once with folders first (runs in a thread).
+
+    The listing is cached per directory and reused as long as the directory's mtime is unchanged,
+    which costs one stat call instead of a new scan when going back to a parent.
+    """
+    key = (path, show_hidden_files)
+    mtime = os.stat(path).st_mtime_ns
+    with _listings_lock:
+        cached = _listings.get(key)
+        if cached is not None and cached[0] == mtime:
+            _listings.move_to_end(key)
+            return cached[1]
+
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if not show_hidden_files and entry.name.startswith('.'):
+                continue
+            try:
+                is_dir = entry.is_dir()  # uses the type from the directory entry, no extra stat in most cases
+            except OSError:
+                is_dir = False
+            entries.append((not is_dir, entry.name.lower(), entry.name, entry.path, is_dir))
+    entries.sort()
+    rows = [  # the name column is rendered as HTML
+        {'name': f'📁 <strong>{html.escape(name)}</strong>' if is_dir else html.escape(name),
+         'path': entry_path, 'dir': is_dir}
+        for _, _, name, entry_path, is_dir in entries
+    ]
+    with _listings_lock:
+        _listings[key] = (mtime, rows)
+        if len(_listings) > MAX_CACHED_LISTINGS:
+            _listings.popitem(last=False)
+    return rows
 
 
 class local_file_picker(ui.dialog):
 
     def __init__(self, directory: str, *,
-                 upper_limit: Optional[str] = ..., multiple: bool = False, show_hidden_files: bool = False) -> None:
+                 upper_limit: Optional[str] = ..., multiple: bool = False, show_hidden_files: bool = False,
+                 page_size: int = 1000, indexed: bool = False) -> None:
         """Local File Picker
 
         This is a simple file picker that allows you to select a file from the local filesystem where NiceGUI is running.
@@ -17,6 +67,8 @@ class local_file_picker(ui.dialog):
         :param upper_limit: The directory to stop at (None: no limit, default: same as the starting directory).
         :param multiple: Whether to allow multiple files to be selected.
         :param show_hidden_files: Whether to show hidden files.
+        :param page_size: The number of entries sent to the grid at once.
+        :param indexed: Whether to index the tree under `upper_limit` in the background and offer a search box.
         """
         super().__init__()
 
@@ -26,17 +78,29 @@ class local_file_picker(ui.dialog):
         else:
             self.upper_limit = Path(directory if upper_limit == ... else upper_limit).expanduser()
         self.show_hidden_files = show_hidden_files
+        self.page_size = page_size
+        self.rows: List[Dict] = []
+        self.index: Optional[FileIndex] = None
+        if indexed:  # refreshed in the background only while the dialog is open
+            self.index = FileIndex.for_directory(str(self.upper_limit or self.path), show_hidden_files)
+        self._uses_index = False
+        self._search_count = 0
 
         with self, ui.card():
             self.add_drives_toggle()
+            if self.index:
+                ui.input(placeholder='Search files', on_change=self.handle_search) \
+                    .props('dense clearable debounce=100').classes('w-96')
             self.grid = ui.aggrid({
                 'columnDefs': [{'field': 'name', 'headerName': 'File'}],
                 'rowSelection': 'multiple' if multiple else 'single',
             }, html_columns=[0]).classes('w-96').on('cellDoubleClicked', self.handle_double_click)
+            self.pagination = ui.pagination(1, 1, direction_links=True, on_change=self.show_page)
+            self.pagination.visible = False
             with ui.row().classes('w-full justify-end'):
                 ui.button('Cancel', on_click=self.close).props('outline')
                 ui.button('Ok', on_click=self._handle_ok)
-        self.update_grid()
+        background_tasks.create(self.update_grid(), name='list directory')
 
     def add_drives_toggle(self):
         if platform.system() == 'Windows':
@@ -44,39 +108,78 @@ class local_file_picker(ui.dialog):
             drives = win32api.GetLogicalDriveStrings().split('\000')[:-1]
             self.drives_toggle = ui.toggle(drives, value=drives[0], on_change=self.update_drive)
 
-    def update_drive(self):
+    async def update_drive(self):
         self.path = Path(self.drives_toggle.value).expanduser()
-        self.update_grid()
-
-    def update_grid(self) -> None:
-        paths = list(self.path.glob('*'))
-        if not self.show_hidden_files:
-            paths = [p for p in paths if not p.name.startswith('.')]
-        paths.sort(key=lambda p: p.name.lower())
-        paths.sort(key=lambda p: not p.is_dir())
-
-        self.grid.options['rowData'] = [
-            {
-                'name': f'📁 <strong>{p.name}</strong>' if p.is_dir() else p.name,
-                'path': str(p),
-            }
-            for p in paths
-        ]
+        await self.update_grid()
+
+    async def update_grid(self) -> None:
+        path = self.path
+        try:
+            rows = await run.io_bound(list_directory, str(path), self.show_hidden_files)
+        except OSError as e:
+            with self:
+                ui.notify(f'Cannot open {path}: {e.strerror}', type='warning')
+            rows = []
+        if path != self.path:  # the user moved on while the directory was being listed
+            return
+        self.rows = rows
         if (self.upper_limit is None and self.path != self.path.parent) or \
                 (self.upper_limit is not None and self.path != self.upper_limit):
-            self.grid.options['rowData'].insert(0, {
-                'name': '📁 <strong>..</strong>',
-                'path': str(self.path.parent),
-            })
+            self.rows = [{'name': '📁 <strong>..</strong>', 'path': str(self.path.parent), 'dir': True}, *rows]
+        self.pagination.max = max(1, math.ceil(len(self.rows) / self.page_size))
+        self.pagination.visible = self.pagination.max > 1
+        if self.pagination.value == 1:
+            self.show_page()
+        else:
+            self.pagination.value = 1  # triggers show_page
+
+    async def handle_search(self, e: events.ValueChangeEventArguments) -> None:
+        self._search_count += 1
+        search_count = self._search_count
+        if not e.value:
+            await self.update_grid()
+            return
+        if not self.index.ready.is_set():
+            ui.notify('Still indexing, results may be incomplete')
+        matches = await self.index.search(e.value)
+        if search_count != self._search_count:  # a newer query was typed meanwhile
+            return
+        self.rows = []
+        for path, is_dir in matches:
+            name = html.escape(os.path.relpath(path, self.index.root))
+            self.rows.append({'name': f'📁 <strong>{name}</strong>' if is_dir else name, 'path': path, 'dir': is_dir})
+        self.pagination.visible = False
+        self.grid.options['rowData'] = self.rows
+        self.grid.update()
+
+    def show_page(self) -> None:
+        first = (self.pagination.value - 1) * self.page_size
+        self.grid.options['rowData'] = self.rows[first:first + self.page_size]
         self.grid.update()
 
-    def handle_double_click(self, e: events.GenericEventArguments) -> None:
+    async def handle_double_click(self, e: events.GenericEventArguments) -> None:
         self.path = Path(e.args['data']['path'])
-        if self.path.is_dir():
-            self.update_grid()
+        if e.args['data']['dir']:
+            await self.update_grid()
         else:
             self.submit([str(self.path)])
 
     async def _handle_ok(self):
         rows = await self.grid.get_selected_rows()
         self.submit([r['path'] for r in rows])
+
+    def _handle_value_change(self, value: bool) -> None:
+        super()._handle_value_change(value)
+        self._use_index(value)
+
+    def _handle_delete(self) -> None:
+        self._use_index(False)
+        super()._handle_delete()
+
+    def _use_index(self, used: bool) -> None:
+        if self.index is not None and used != self._uses_index:
+            self._uses_index = used
+            if used:
+                self.index.start()
+            else:
+                self.index.stop()
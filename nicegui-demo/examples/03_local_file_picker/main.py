@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+from pathlib import Path
+
 from local_file_picker import local_file_picker
 
 from nicegui import ui
@@ -9,9 +11,16 @@ async def pick_file() -> None:
     ui.notify(f'You chose {result}')
 
 
+async def search_file() -> None:
+    # the index crawls the whole tree under the directory, so keep it small
+    result = await local_file_picker(str(Path(__file__).parent.parent), multiple=True, indexed=True)
+    ui.notify(f'You chose {result}')
+
+
 @ui.page('/')
 def index():
     ui.button('Choose file', on_click=pick_file, icon='folder')
+    ui.button('Search the examples', on_click=search_file, icon='search')
 
 
 ui.run()
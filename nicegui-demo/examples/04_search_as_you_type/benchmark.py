@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Keystroke-to-render latency of the local and the HTTP search backend.
+
+Run with `uv run benchmark.py [drinks.json]`. Each query is typed one character at a time;
+every keystroke is searched without the query cache and rendered into result cards of a page
+that is never sent anywhere, so the numbers leave out debouncing and the websocket.
+The HTTP backend is skipped when thecocktaildb.com cannot be reached.
+"""
+import asyncio
+import statistics
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List
+
+from main import ResultCards
+from search_backend import HttpBackend, LocalBackend
+
+from nicegui import Client
+from nicegui.page import page
+
+PATH = Path(sys.argv[1] if len(sys.argv) > 1 else Path(__file__).parent / 'drinks.json')
+QUERIES = ['margarita', 'gin fizz', 'vodka', 'espresso martini', 'zzz']
+
+
+async def measure(name: str, backend) -> None:
+    client = Client(page(''), request=None)
+    with client:
+        cards = ResultCards()
+    search_ms: List[float] = []
+    total_ms: List[float] = []
+    for query in QUERIES:
+        for end in range(1, len(query) + 1):
+            t = perf_counter()
+            results: List[Dict] = await backend.search(query[:end])
+            searched = perf_counter()
+            with client:
+                cards.show(results)
+            search_ms.append((searched - t) * 1000)
+            total_ms.append((perf_counter() - t) * 1000)
+    print(f'{name:<6} search p50 {statistics.median(search_ms):8.3f} ms   max {max(search_ms):8.3f} ms   '
+          f'keystroke-to-render p50 {statistics.median(total_ms):8.3f} ms   max {max(total_ms):8.3f} ms')
+
+
+async def main() -> None:
+    t = perf_counter()
+    local = LocalBackend(PATH)
+    print(f'Indexed {len(local.drinks)} drinks ({len(local.index)} words) in {(perf_counter() - t) * 1000:.1f} ms\n')
+    await measure('local', local)
+    http = HttpBackend()
+    try:
+        await http.search('a')
+    except Exception as e:  # pylint: disable=broad-except
+        print(f'http   skipped: {e!r}')
+    else:
+        await measure('http', http)
+
+
+asyncio.run(main())
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""Download every drink of thecocktaildb.com into drinks.json for the local search backend.
+
+Run with `uv run dump_drinks.py`; the bundled drinks.json is a small stand-in in the same shape.
+"""
+import json
+import string
+from pathlib import Path
+
+import httpx
+
+from search_backend import API_URL
+
+drinks = {}
+with httpx.Client(timeout=30) as client:
+    for first in string.ascii_lowercase + string.digits:  # the free API lists drinks by first letter
+        for drink in client.get(API_URL, params={'f': first}).json()['drinks'] or []:
+            drinks[drink['idDrink']] = drink
+(Path(__file__).parent / 'drinks.json').write_text(json.dumps({'drinks': list(drinks.values())}, indent=1) + '\n')
+print(f'Saved {len(drinks)} drinks')
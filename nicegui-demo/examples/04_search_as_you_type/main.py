@@ -1,37 +1,60 @@
 #!/usr/bin/env python3
-import asyncio
-from typing import Optional
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
 
-import httpx
+from query_cache import QueryCache
+from search_backend import HttpBackend, LocalBackend
 
 from nicegui import events, ui
 
-api = httpx.AsyncClient()
-running_query: Optional[asyncio.Task] = None
-
-
-async def search(e: events.ValueChangeEventArguments) -> None:
-    """Search for cocktails as you type."""
-    global running_query  # pylint: disable=global-statement # noqa: PLW0603
-    if running_query:
-        running_query.cancel()  # cancel the previous query; happens when you type fast
-    search_field.classes('mt-2', remove='mt-24')  # move the search field up
-    results.clear()
-    # store the http coroutine in a task so we can cancel it later if needed
-    running_query = asyncio.create_task(api.get(f'https://www.thecocktaildb.com/api/json/v1/1/search.php?s={e.value}'))
-    response = await running_query
-    if response.text == '':
-        return
-    with results:  # enter the context of the the results row
-        for drink in response.json()['drinks'] or []:  # iterate over the response data of the api
-            with ui.image(drink['strDrinkThumb']).classes('w-64'):
-                ui.label(drink['strDrink']).classes('absolute-bottom text-subtitle2 text-center')
-    running_query = None
-
-# create a search field which is initially focused and leaves space at the top
-search_field = ui.input(on_change=search) \
-    .props('autofocus outlined rounded item-aligned input-class="ml-3"') \
-    .classes('w-96 self-center mt-24 transition-all')
-results = ui.row()
-
-ui.run()
+# SEARCH_BACKEND=local searches the bundled dump (or DRINKS_JSON) in memory and works offline
+if os.environ.get('SEARCH_BACKEND') == 'local':
+    backend = LocalBackend(Path(os.environ.get('DRINKS_JSON', Path(__file__).parent / 'drinks.json')))
+else:
+    backend = HttpBackend()
+
+# shared by all clients: identical queries are answered from the cache or from the request already running
+drinks = QueryCache(backend.search, ttl=300, max_size=256)
+
+
+class ResultCards:
+    """A row of result cards that are updated in place instead of being cleared and rebuilt."""
+
+    def __init__(self) -> None:
+        self.row = ui.row()
+        self.cards: List[Tuple[ui.image, ui.label]] = []
+
+    def show(self, results: List[Dict]) -> None:
+        for i, drink in enumerate(results):
+            if i == len(self.cards):
+                with self.row, ui.image().classes('w-64') as image:
+                    label = ui.label().classes('absolute-bottom text-subtitle2 text-center')
+                self.cards.append((image, label))
+            image, label = self.cards[i]
+            image.set_source(drink['strDrinkThumb'])
+            label.set_text(drink['strDrink'])
+            image.set_visibility(True)
+        for image, _ in self.cards[len(results):]:
+            image.set_visibility(False)
+
+
+@ui.page('/')
+def index():
+    async def search(e: events.ValueChangeEventArguments) -> None:
+        """Search for cocktails as you type."""
+        search_field.classes('mt-2', remove='mt-24')  # move the search field up
+        results = await drinks.get(e.value)
+        if e.value != search_field.value:
+            return  # this client typed on while we were waiting; the newer search renders its own results
+        cards.show(results)
+
+    # create a search field which is initially focused and leaves space at the top
+    search_field = ui.input(on_change=search) \
+        .props(f'autofocus outlined rounded item-aligned input-class="ml-3" debounce={backend.debounce_ms}') \
+        .classes('w-96 self-center mt-24 transition-all')
+    cards = ResultCards()
+
+
+if __name__ in {'__main__', '__mp_main__'}:
+    ui.run()
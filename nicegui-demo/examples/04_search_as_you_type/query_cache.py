@@ -0,0 +1,47 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class QueryCache:
+    """Results of an async lookup, cached by normalized query with a TTL and LRU eviction.
+
+    A query that is already running is awaited instead of being sent again,
+    so several clients typing the same text cause a single request.
+    """
+
+    def __init__(self, fetch: Callable[[str], Awaitable[Any]], *, ttl: float = 300.0, max_size: int = 256) -> None:
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Lower case with single spaces; a trailing space is kept, since it can end the last word of a search."""
+        key = ' '.join(query.lower().split())
+        return key + ' ' if key and query[-1].isspace() else key
+
+    async def get(self, query: str) -> Any:
+        key = self.normalize(query)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            return entry[1]
+        if key not in self._pending:
+            self._pending[key] = asyncio.create_task(self._fetch(key))
+        # a client that types on cancels its wait, but not the request other clients may be waiting for
+        return await asyncio.shield(self._pending[key])
+
+    async def _fetch(self, key: str) -> Any:
+        try:
+            result = await self.fetch(key)
+        finally:
+            del self._pending[key]
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return result
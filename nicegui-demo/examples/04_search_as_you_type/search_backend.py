@@ -0,0 +1,107 @@
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+API_URL = 'https://www.thecocktaildb.com/api/json/v1/1/search.php'
+TOKEN = re.compile(r'\w+')
+
+# how much a match in each field counts; the name matters most, like the remote API which only searches names
+FIELD_WEIGHTS = {'strDrink': 8, 'strIngredient': 2, 'strCategory': 1, 'strGlass': 1}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+
+class HttpBackend:
+    """Drinks from thecocktaildb.com, one request per query."""
+
+    debounce_ms = 300  # wait for a pause in typing before sending a request
+
+    def __init__(self) -> None:
+        self.client = httpx.AsyncClient()
+
+    async def search(self, query: str) -> List[Dict]:
+        response = await self.client.get(API_URL, params={'s': query})
+        if response.text == '':
+            return []
+        return response.json()['drinks'] or []
+
+
+class _TrieNode:
+    __slots__ = ('children', 'docs')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.docs: Dict[int, int] = {}  # every drink with a word below this node -> its best field weight
+
+
+class LocalBackend:
+    """Drinks from a JSON dump in the API's response shape, searched in memory.
+
+    Each word of a drink (name, ingredients, category, glass) goes into an inverted index for complete words
+    and into a prefix trie for the word that is still being typed. Every trie node keeps the drinks below it,
+    so a prefix lookup walks one node per character and never enumerates the words it stands for.
+    """
+
+    debounce_ms = 50  # answering is cheaper than the websocket round trip, so search almost on every keystroke
+
+    def __init__(self, path: Path, *, limit: int = 25) -> None:
+        self.limit = limit  # the remote API answers at most 25 drinks as well
+        self.drinks: List[Dict] = json.loads(path.read_text())['drinks']
+        self.names = [drink['strDrink'].lower() for drink in self.drinks]
+        self.index: Dict[str, Dict[int, int]] = {}
+        self.trie = _TrieNode()
+        for doc, drink in enumerate(self.drinks):
+            for field, value in drink.items():
+                weight = FIELD_WEIGHTS.get(field.rstrip('0123456789'))
+                if weight and value:
+                    for word in tokenize(value):
+                        self._add(word, doc, weight)
+
+    def _add(self, word: str, doc: int, weight: int) -> None:
+        postings = self.index.setdefault(word, {})
+        postings[doc] = max(weight, postings.get(doc, 0))
+        node = self.trie
+        for char in word:
+            node = node.children.setdefault(char, _TrieNode())
+            node.docs[doc] = max(weight, node.docs.get(doc, 0))
+
+    def _prefix(self, prefix: str) -> Dict[int, int]:
+        node: Optional[_TrieNode] = self.trie
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return {}
+        return node.docs
+
+    async def search(self, query: str) -> List[Dict]:
+        return self.lookup(query)
+
+    def lookup(self, query: str) -> List[Dict]:
+        """Drinks containing every word of `query`, the last one as a prefix unless it is followed by a space.
+
+        Name matches rank before ingredient matches, names starting with the query first, then shorter names.
+        If no drink matches word by word, names containing the query anywhere are returned, like the remote API does.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        postings = [self.index.get(word, {}) for word in words[:-1]]
+        postings.append(self.index.get(words[-1], {}) if query[-1].isspace() else self._prefix(words[-1]))
+        postings.sort(key=len)
+        scores = dict(postings[0])
+        for other in postings[1:]:
+            scores = {doc: score + other[doc] for doc, score in scores.items() if doc in other}
+        phrase = ' '.join(words)
+        if scores:
+            for doc in scores:
+                if self.names[doc].startswith(phrase):
+                    scores[doc] += 16
+        else:
+            scores = {doc: 0 for doc, name in enumerate(self.names) if phrase in name}
+        ranked = sorted(scores, key=lambda doc: (-scores[doc], len(self.names[doc]), self.names[doc]))
+        return [self.drinks[doc] for doc in ranked[:self.limit]]
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Insert rate and paginated list latency of the user table with each SQLite profile.
+
+Run with `uv run benchmark.py [users]`. Every profile gets a fresh database file in a temporary directory,
+seeded with the bulk API; then single-row inserts, a bulk update and pages from the start,
+the middle and the end of the list (newest first, like the app) are timed.
+"""
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import models
+from database import PROFILES, init_db
+from tortoise import Tortoise
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+PAGE_SIZE = 20
+
+
+async def measure(profile: str, directory: Path) -> None:
+    await init_db(str(directory / f'{profile}.sqlite3'), profile)
+    random.seed(0)
+
+    t = perf_counter()
+    await models.User.insert_many((f'user {i}', random.randint(0, 99)) for i in range(USERS))
+    bulk = USERS / (perf_counter() - t)
+
+    t = perf_counter()
+    for i in range(200):
+        await models.User.create(name=f'single {i}', age=i % 100)  # one transaction per row, like the app
+    single = 200 / (perf_counter() - t)
+
+    t = perf_counter()
+    await models.User.update_many((id_, f'renamed {id_}', 42) for id_ in range(1, USERS // 10 + 1))
+    updates = USERS // 10 / (perf_counter() - t)
+
+    count = await models.User.all().count()
+    latencies = {}
+    for name, offset in {'first': 0, 'middle': count // 2, 'last': count - PAGE_SIZE}.items():
+        samples = []
+        for _ in range(20):
+            t = perf_counter()
+            await models.User.all().order_by('-id').offset(offset).limit(PAGE_SIZE)
+            samples.append((perf_counter() - t) * 1000)
+        latencies[name] = statistics.median(samples)
+    t = perf_counter()
+    await models.User.filter(name='user 12345')
+    lookup = (perf_counter() - t) * 1000
+
+    await Tortoise.close_connections()
+    pages = '  '.join(f'{name} {ms:5.2f} ms' for name, ms in latencies.items())
+    print(f'{profile:<12} bulk insert {bulk:>9,.0f}/s   single insert {single:>7,.0f}/s   '
+          f'bulk update {updates:>9,.0f}/s   page {pages}   name lookup {lookup:5.2f} ms')
+
+
+async def main() -> None:
+    print(f'{USERS:,} users, pages of {PAGE_SIZE}\n')
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in PROFILES:
+            await measure(profile, Path(directory))
+
+
+asyncio.run(main())
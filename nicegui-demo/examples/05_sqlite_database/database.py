@@ -0,0 +1,27 @@
+from typing import Any, Dict
+from urllib.parse import urlencode
+
+from tortoise import Tortoise
+
+# PRAGMAs applied to the connection at startup; Tortoise passes query parameters of a sqlite URL on as PRAGMAs
+PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {},  # SQLite's own settings, apart from the WAL journal Tortoise always turns on
+    'performance': {
+        'journal_mode': 'WAL',  # readers and the writer do not block each other
+        'synchronous': 'NORMAL',  # in WAL mode a crash can lose the last commits, but never corrupts the database
+        'mmap_size': 256 * 1024**2,
+        'cache_size': -64 * 1024,  # in KiB
+        'busy_timeout': 5000,  # in ms, wait for a lock instead of failing at once
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+def db_url(path: str = 'db.sqlite3', profile: str = 'performance') -> str:
+    pragmas = PROFILES[profile]
+    return f'sqlite://{path}' + (f'?{urlencode(pragmas)}' if pragmas else '')
+
+
+async def init_db(path: str = 'db.sqlite3', profile: str = 'performance') -> None:
+    await Tortoise.init(db_url=db_url(path, profile), modules={'models': ['models']})
+    await Tortoise.generate_schemas()  # also adds missing indexes to an existing database
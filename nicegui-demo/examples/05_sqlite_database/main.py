@@ -1,39 +1,124 @@
 #!/usr/bin/env python3
-from typing import List
+import asyncio
+import os
+import weakref
+from typing import Any, Dict, List, Optional
 
 import models
+from database import init_db
 from tortoise import Tortoise
+from write_behind import WriteBehind
 
-from nicegui import app, ui
+from nicegui import app, events, ui
 
+PAGE_SIZE = 20
 
-async def init_db() -> None:
-    await Tortoise.init(db_url='sqlite://db.sqlite3', modules={'models': ['models']})
-    await Tortoise.generate_schemas()
+user_lists: 'weakref.WeakSet[UserList]' = weakref.WeakSet()  # the lists of all open pages
+
+
+def open_lists() -> List['UserList']:
+    return [user_list for user_list in user_lists if not user_list.column.is_deleted]
+
+
+def show_changes(changed: Dict[int, Dict[str, Any]]) -> None:
+    for user_list in open_lists():
+        user_list.show_changes(changed)
+
+
+async def refresh_others(origin: 'UserList') -> None:
+    """Show a new or deleted user on the other pages."""
+    await asyncio.gather(*(user_list.refresh() for user_list in open_lists() if user_list is not origin))
+
+# shared by all clients, so one transaction carries everyone's edits
+changes = WriteBehind(models.User, delay=0.5, on_flush=show_changes)
+
+
+async def open_db() -> None:
+    await init_db('db.sqlite3', os.environ.get('SQLITE_PROFILE', 'performance'))
 
 
 async def close_db() -> None:
+    await changes.flush()
     await Tortoise.close_connections()
 
-app.on_startup(init_db)
+app.on_startup(open_db)
 app.on_shutdown(close_db)
 
 
-@ui.refreshable
-async def list_of_users() -> None:
-    async def delete(user: models.User) -> None:
-        await user.delete()
-        list_of_users.refresh()
+class UserCard(ui.card):
+
+    def __init__(self, user: models.User, user_list: 'UserList') -> None:
+        super().__init__()
+        self.user_id = user.id
+        self._showing = False
+        with self, ui.row().classes('items-center'):
+            self.name = ui.input('Name', value=user.name, on_change=self._set_name)
+            self.age = ui.number('Age', value=user.age, format='%.0f', on_change=self._set_age).classes('w-20')
+            ui.button(icon='delete', on_click=lambda: user_list.delete(self.user_id)).props('flat')
+        for field in (self.name, self.age):
+            field.on('blur', changes.flush)
+
+    def _set_name(self, e: events.ValueChangeEventArguments) -> None:
+        if not self._showing:
+            changes.set(self.user_id, 'name', e.value)
+
+    def _set_age(self, e: events.ValueChangeEventArguments) -> None:
+        if e.value is not None and not self._showing:  # the field is empty while the user types a new age
+            changes.set(self.user_id, 'age', int(e.value))
+
+    def show(self, values: Dict[str, Any]) -> None:
+        """Take over values changed elsewhere, leaving fields alone that already show them or are being edited."""
+        self._showing = True  # the values are already in the database, they must not be written again
+        try:
+            for field, value in values.items():
+                element = {'name': self.name, 'age': self.age}[field]
+                if element.value != value and field not in changes.pending.get(self.user_id, {}):
+                    element.set_value(value)
+        finally:
+            self._showing = False
+
+
+class UserList:
+    """One page of users, newest first; a refresh only touches the cards of rows that changed."""
+
+    def __init__(self) -> None:
+        self.cards: Dict[int, UserCard] = {}
+        self.column = ui.column()
+        self.pagination = ui.pagination(1, 1, direction_links=True, on_change=self.refresh)
+        self._lock = asyncio.Lock()
+        user_lists.add(self)
+
+    async def refresh(self) -> None:
+        async with self._lock:  # overlapping refreshes would both create the cards of new rows
+            await changes.flush()  # the page has to include edits that are still waiting
+            count = await models.User.all().count()
+            self.pagination.max = max(1, -(-count // PAGE_SIZE))
+            self.pagination.set_visibility(self.pagination.max > 1)
+            offset = (min(self.pagination.value, self.pagination.max) - 1) * PAGE_SIZE
+            users = await models.User.all().order_by('-id').offset(offset).limit(PAGE_SIZE)
+            for user_id in set(self.cards) - {user.id for user in users}:
+                self.column.remove(self.cards.pop(user_id))
+            for index, user in enumerate(users):
+                card: Optional[UserCard] = self.cards.get(user.id)
+                if card is None:
+                    with self.column:
+                        card = self.cards[user.id] = UserCard(user, self)
+                else:
+                    card.show({'name': user.name, 'age': user.age})
+                if self.column.default_slot.children.index(card) != index:
+                    card.move(self.column, target_index=index)
+
+    def show_changes(self, changed: Dict[int, Dict[str, Any]]) -> None:
+        """Patch the cards of the changed rows that are on this page."""
+        for user_id, values in changed.items():
+            if user_id in self.cards:
+                self.cards[user_id].show(values)
 
-    users: List[models.User] = await models.User.all()
-    for user in reversed(users):
-        with ui.card():
-            with ui.row().classes('items-center'):
-                ui.input('Name', on_change=user.save) \
-                    .bind_value(user, 'name').on('blur', list_of_users.refresh)
-                ui.number('Age', on_change=user.save, format='%.0f') \
-                    .bind_value(user, 'age').on('blur', list_of_users.refresh).classes('w-20')
-                ui.button(icon='delete', on_click=lambda u=user: delete(u)).props('flat')
+    async def delete(self, user_id: int) -> None:
+        changes.discard(user_id)
+        await models.User.filter(id=user_id).delete()
+        await self.refresh()
+        await refresh_others(self)
 
 
 @ui.page('/')
@@ -42,13 +127,18 @@ async def index():
         await models.User.create(name=name.value, age=age.value or 0)
         name.value = ''
         age.value = None
-        list_of_users.refresh()
+        if user_list.pagination.value == 1:
+            await user_list.refresh()
+        else:
+            user_list.pagination.value = 1  # new users are on the first page; refreshes through on_change
+        await refresh_others(user_list)
 
     with ui.column().classes('mx-auto'):
         with ui.row().classes('w-full items-center px-4'):
             name = ui.input(label='Name')
             age = ui.number(label='Age', format='%.0f').classes('w-20')
             ui.button(on_click=create, icon='add').props('flat').classes('ml-auto')
-        await list_of_users()
+        user_list = UserList()
+        await user_list.refresh()
 
 ui.run()
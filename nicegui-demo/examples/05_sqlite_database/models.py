@@ -1,7 +1,40 @@
+from itertools import islice
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
 from tortoise import fields, models
+from tortoise.transactions import in_transaction
+
+
+def _batches(rows: Iterable[Sequence], size: int) -> Iterator[List[Sequence]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 class User(models.Model):
     id = fields.IntField(pk=True)
-    name = fields.CharField(max_length=255)
-    age = fields.IntField()
\ No newline at end of file
+    name = fields.CharField(max_length=255, db_index=True)
+    age = fields.IntField()
+
+    @classmethod
+    async def insert_many(cls, rows: Iterable[Tuple[str, int]], *, batch_size: int = 10_000) -> None:
+        """Insert (name, age) rows with ``executemany`` in one transaction, without creating model instances."""
+        await cls._execute_many(f'INSERT INTO "{cls._meta.db_table}" ("name", "age") VALUES (?, ?)', rows, batch_size)
+
+    @classmethod
+    async def update_many(cls, rows: Iterable[Tuple[int, str, int]], *, batch_size: int = 10_000) -> None:
+        """Set name and age of (id, name, age) rows in one transaction."""
+        await cls._execute_many(f'UPDATE "{cls._meta.db_table}" SET "name" = ?, "age" = ? WHERE "id" = ?',
+                                ((name, age, id_) for id_, name, age in rows), batch_size)
+
+    @classmethod
+    async def delete_many(cls, ids: Iterable[int], *, batch_size: int = 10_000) -> None:
+        """Delete users by id in one transaction."""
+        await cls._execute_many(f'DELETE FROM "{cls._meta.db_table}" WHERE "id" = ?',
+                                ((id_,) for id_ in ids), batch_size)
+
+    @classmethod
+    async def _execute_many(cls, sql: str, rows: Iterable[Sequence], batch_size: int) -> None:
+        async with in_transaction() as connection:
+            for batch in _batches(rows, batch_size):  # bounded memory for generators of any length
+                await connection.execute_many(sql, batch)
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Callable, Dict, Optional, Type
+
+from tortoise import models
+from tortoise.transactions import in_transaction
+
+from nicegui import background_tasks
+
+
+class WriteBehind:
+    """Field changes of a model, collected per row and written in one transaction once typing pauses.
+
+    Several changes of the same row are merged into one ``UPDATE`` of only the changed columns,
+    instead of saving the whole row on every keystroke.
+    """
+
+    def __init__(self, model: Type[models.Model], *, delay: float = 0.5,
+                 on_flush: Optional[Callable[[Dict[Any, Dict[str, Any]]], Any]] = None) -> None:
+        self.model = model
+        self.delay = delay
+        self.on_flush = on_flush  # called with the written changes by primary key, e.g. to show them on other pages
+        self.pending: Dict[Any, Dict[str, Any]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+
+    def set(self, pk: Any, field: str, value: Any) -> None:
+        """Remember a new value and (re)start the countdown to the next flush."""
+        self.pending.setdefault(pk, {})[field] = value
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(
+            self.delay, lambda: background_tasks.create(self.flush(), name='write-behind flush'))
+
+    def discard(self, pk: Any) -> None:
+        """Forget the changes of a row that is about to be deleted."""
+        self.pending.pop(pk, None)
+
+    async def flush(self) -> None:
+        """Write all pending changes now, e.g. when an input loses focus or the app shuts down."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:  # a flush waits for the previous one, so rows are written in the order they changed
+            pending, self.pending = self.pending, {}
+            if not pending:
+                return
+            async with in_transaction() as connection:
+                for pk, changes in pending.items():
+                    await self.model.filter(pk=pk).using_db(connection).update(**changes)
+            if self.on_flush is not None:
+                self.on_flush(pending)
@@ -1 +1,15 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))  # main.py imports its sibling modules like a script does
+
 pytest_plugins = ['nicegui.testing.plugin']
+
+
+@pytest.fixture(autouse=True)
+def todo_data(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Start every test with an empty todo log."""
+    monkeypatch.setenv('TODO_DATA', str(tmp_path))
+    return tmp_path
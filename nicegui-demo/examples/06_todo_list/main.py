@@ -1,60 +1,170 @@
 #!/usr/bin/env python3
+import os
 from dataclasses import dataclass, field
-from typing import Callable, List
+from pathlib import Path
+from typing import Callable, Dict, List
 
-from nicegui import ui
+from todo_log import TodoLog
+
+from nicegui import app, ui
 
 
 @dataclass
 class TodoItem:
+    id: int
     name: str
     done: bool = False
 
 
 @dataclass
 class ToDoList:
+    """Items keyed by id, with running counters so that no change has to look at the other items."""
+
     title: str
-    on_change: Callable
-    items: List[TodoItem] = field(default_factory=list)
+    # called with 'add', 'remove', 'done' or 'rename' and the item; one per open page, plus the log
+    listeners: List[Callable[[str, TodoItem], None]] = field(default_factory=list)
+    items: Dict[int, TodoItem] = field(default_factory=dict)
+    done: int = 0
+    next_id: int = 0
 
-    def add(self, name: str, done: bool = False) -> None:
-        self.items.append(TodoItem(name, done))
-        self.on_change()
+    @property
+    def remaining(self) -> int:
+        return len(self.items) - self.done
+
+    def add(self, name: str, done: bool = False) -> TodoItem:
+        item = TodoItem(self.next_id, name, done)
+        self.items[item.id] = item
+        self.next_id += 1
+        self.done += done
+        self._notify('add', item)
+        return item
 
     def remove(self, item: TodoItem) -> None:
-        self.items.remove(item)
-        self.on_change()
-
-
-@ui.refreshable
-def todo_ui():
-    if not todos.items:
-        ui.label('List is empty.').classes('mx-auto')
-        return
-    ui.linear_progress(sum(item.done for item in todos.items) / len(todos.items), show_value=False)
-    with ui.row().classes('justify-center w-full'):
-        ui.label(f'Completed: {sum(item.done for item in todos.items)}')
-        ui.label(f'Remaining: {sum(not item.done for item in todos.items)}')
-    for item in todos.items:
-        with ui.row().classes('items-center'):
-            ui.checkbox(value=item.done, on_change=todo_ui.refresh).bind_value(item, 'done') \
+        if self.items.pop(item.id, None) is not None:
+            self.done -= item.done
+            self._notify('remove', item)
+
+    def set_done(self, item: TodoItem, done: bool) -> None:
+        if item.done != done:
+            item.done = done
+            self.done += 1 if done else -1
+            self._notify('done', item)
+
+    def rename(self, item: TodoItem, name: str) -> None:
+        if item.name != name:
+            item.name = name
+            self._notify('rename', item)
+
+    def _notify(self, change: str, item: TodoItem) -> None:
+        for listener in list(self.listeners):  # a listener may remove itself
+            listener(change, item)
+
+
+class TodoRow(ui.row):
+
+    def __init__(self, todos: ToDoList, item: TodoItem) -> None:
+        super().__init__()
+        self.classes('items-center')
+        with self:
+            self.checkbox = ui.checkbox(value=item.done, on_change=lambda e: todos.set_done(item, e.value)) \
                 .mark(f'checkbox-{item.name.lower().replace(" ", "-")}')
-            ui.input(value=item.name).classes('flex-grow').bind_value(item, 'name')
-            ui.button(on_click=lambda item=item: todos.remove(item), icon='delete').props('flat fab-mini color=grey')
-
-
-todos = ToDoList('My Weekend', on_change=todo_ui.refresh)
-todos.add('Order pizza', done=True)
-todos.add('New NiceGUI Release')
-todos.add('Clean the house')
-todos.add('Call mom')
-
-with ui.card().classes('w-80 items-stretch'):
-    ui.label().bind_text_from(todos, 'title').classes('text-semibold text-2xl')
-    todo_ui()
-    add_input = ui.input('New item').classes('mx-12').mark('new-item')
-    add_input.on('keydown.enter', lambda: todos.add(add_input.value))
-    add_input.on('keydown.enter', lambda: add_input.set_value(''))
+            self.input = ui.input(value=item.name, on_change=lambda e: todos.rename(item, e.value)).classes('flex-grow')
+            ui.button(on_click=lambda: todos.remove(item), icon='delete').props('flat fab-mini color=grey')
+
+
+class TodoView:
+    """Rows keyed by item id; a change patches its own row and the summary instead of rebuilding the list."""
+
+    def __init__(self, todos: ToDoList) -> None:
+        self.todos = todos
+        self.empty = ui.label('List is empty.').classes('mx-auto')
+        self.progress = ui.linear_progress(show_value=False)
+        with ui.row().classes('justify-center w-full') as self.summary:
+            self.completed = ui.label()
+            self.remaining = ui.label()
+        self.list = ui.column().classes('w-full')
+        self.rows: Dict[int, TodoRow] = {}
+        for item in todos.items.values():
+            self._add_row(item)
+        self._update_summary()
+
+    def update(self, change: str, item: TodoItem) -> None:
+        if self.list.is_deleted:  # the client was pruned without a disconnect, e.g. it never connected
+            self.close()
+            return
+        if change == 'add':
+            self._add_row(item)
+        elif change == 'remove':
+            self.list.remove(self.rows.pop(item.id))
+        elif change == 'done':
+            self.rows[item.id].checkbox.value = item.done  # no-op if the change came from this checkbox
+        else:
+            self.rows[item.id].input.value = item.name
+            return
+        self._update_summary()
+
+    def close(self) -> None:
+        """Stop following the changes of the list."""
+        if self.update in self.todos.listeners:
+            self.todos.listeners.remove(self.update)
+
+    def _add_row(self, item: TodoItem) -> None:
+        with self.list:
+            self.rows[item.id] = TodoRow(self.todos, item)
+
+    def _update_summary(self) -> None:
+        total = len(self.todos.items)
+        self.empty.set_visibility(total == 0)
+        self.progress.set_visibility(total > 0)
+        self.summary.set_visibility(total > 0)
+        self.progress.set_value(self.todos.done / total if total else 0)
+        self.completed.set_text(f'Completed: {self.todos.done}')
+        self.remaining.set_text(f'Remaining: {self.todos.remaining}')
+
+
+todos = ToDoList('My Weekend')
+log = TodoLog(Path(os.environ.get('TODO_DATA', '.data/todos')))
+
+
+def record(change: str, item: TodoItem) -> None:
+    if change == 'add':
+        log.append({'op': 'add', 'id': item.id, 'name': item.name, 'done': item.done})
+    elif change == 'remove':
+        log.append({'op': 'remove', 'id': item.id})
+    elif change == 'done':
+        log.append({'op': 'done', 'id': item.id, 'done': item.done})
+    else:
+        log.append({'op': 'rename', 'id': item.id, 'name': item.name})
+
+
+def load() -> None:
+    items, todos.next_id = log.load()
+    for id_, (name, done) in items.items():
+        todos.items[id_] = TodoItem(id_, name, done)
+        todos.done += done
+    todos.listeners.append(record)
+    if todos.next_id == 0:  # a new list
+        todos.add('Order pizza', done=True)
+        todos.add('New NiceGUI Release')
+        todos.add('Clean the house')
+        todos.add('Call mom')
+
+app.on_startup(load)
+app.on_shutdown(log.close)
+
+
+@ui.page('/')
+def index():
+    with ui.card().classes('w-80 items-stretch'):
+        ui.label(todos.title).classes('text-semibold text-2xl')
+        view = TodoView(todos)
+        add_input = ui.input('New item').classes('mx-12').mark('new-item')
+        add_input.on('keydown.enter', lambda: todos.add(add_input.value))
+        add_input.on('keydown.enter', lambda: add_input.set_value(''))
+    # every change is sent to all open pages as an update of the affected row
+    todos.listeners.append(view.update)
+    ui.context.client.on_disconnect(view.close)
+
 
 if __name__ in {'__main__', '__mp_main__'}:
     ui.run()
@@ -1,8 +1,13 @@
+from typing import Callable, List, Tuple
+
 import pytest
 
+from nicegui.element import Element
+from nicegui.outbox import Outbox
 from nicegui.testing import User
 
 from . import main
+from .todo_log import TodoLog
 
 # pylint: disable=missing-function-docstring
 
@@ -34,3 +39,47 @@ async def test_adding_items(user: User) -> None:
     user.find('checkbox-buy-milk').click()
     await user.should_see('Completed: 2')
     await user.should_see('Remaining: 4')
+
+
+@pytest.mark.module_under_test(main)
+async def test_toggle_work_is_independent_of_list_size(user: User, monkeypatch: pytest.MonkeyPatch) -> None:
+    await user.open('/')
+    updated: List[Element] = []
+    enqueue_update = Outbox.enqueue_update
+
+    def count_update(outbox: Outbox, element: Element) -> None:
+        updated.append(element)
+        enqueue_update(outbox, element)
+    monkeypatch.setattr(Outbox, 'enqueue_update', count_update)
+
+    def work_per_toggle(size: int) -> Tuple[int, int]:
+        """Number of elements created and of element updates sent when an item is checked."""
+        for i in range(len(main.todos.items), size):
+            main.todos.add(f'Item {i}')
+        elements = len(user.client.elements)
+        updated.clear()
+        user.find(f'checkbox-item-{size - 1}').click()
+        return len(user.client.elements) - elements, len(updated)
+
+    small = work_per_toggle(100)
+    large = work_per_toggle(10_000)
+    assert small[0] == 0
+    assert small == large  # only the toggled row and the summary change, however long the list is
+    assert (main.todos.done, main.todos.remaining) == (3, 9_997)
+    await user.should_see('Completed: 3')
+
+
+@pytest.mark.module_under_test(main)
+async def test_changes_reach_other_clients_and_survive_a_restart(create_user: Callable[[], User]) -> None:
+    first, second = create_user(), create_user()
+    await first.open('/')
+    await second.open('/')
+    first.find('new-item').type('Buy milk').trigger('keydown.enter')
+    await second.should_see('Buy milk')
+    second.find('checkbox-buy-milk').click()
+    await first.should_see('Completed: 2')
+
+    main.log.close()
+    items, next_id = TodoLog(main.log.directory).load()
+    assert next_id == 5
+    assert items[4] == ('Buy milk', True)
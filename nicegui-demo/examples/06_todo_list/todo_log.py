@@ -0,0 +1,101 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from nicegui import background_tasks, run
+
+Item = Tuple[str, bool]  # name, done
+
+
+class TodoLog:
+    """Todo operations appended to a JSON-lines log and compacted into a snapshot.
+
+    A snapshot is written once the log holds `compact_every` operations, or one per item for longer lists.
+    Every operation carries a sequence number and the snapshot stores the last one it includes,
+    so a crash between writing the snapshot and removing the old log only leaves operations that are skipped on load.
+    The snapshot is written in a thread while new operations go to a fresh log.
+    Loading reads the snapshot and replays a bounded tail, however many operations were ever written.
+    """
+
+    def __init__(self, directory: Path, *, compact_every: int = 10_000) -> None:
+        self.directory = directory
+        self.snapshot_path = directory / 'snapshot.json'
+        self.log_path = directory / 'log.jsonl'
+        self.old_log_path = directory / 'log.old.jsonl'  # operations that the snapshot being written will include
+        self.compact_every = compact_every
+        self.items: Dict[int, Item] = {}
+        self.next_id = 0
+        self.seq = 0
+        self.tail = 0  # operations in the log since the last snapshot
+        self._file: Any = None
+        self._compaction: Optional[asyncio.Task] = None
+
+    def load(self) -> Tuple[Dict[int, Item], int]:
+        """Read the snapshot and the log, then open the log for appending; returns the items and the next id."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.snapshot_path.exists():
+            snapshot = json.loads(self.snapshot_path.read_text())
+            self.items = {id_: (name, done) for id_, name, done in snapshot['items']}
+            self.next_id = snapshot['next_id']
+            self.seq = snapshot['seq']
+        for path in (self.old_log_path, self.log_path):
+            if path.exists():
+                with path.open() as f:
+                    for line in f:
+                        try:
+                            op = json.loads(line)
+                        except json.JSONDecodeError:  # the last line of a crashed process may be incomplete
+                            break
+                        if op['seq'] > self.seq:
+                            self._apply(op)
+                            self.seq = op['seq']
+                            self.tail += 1
+        self._file = self.log_path.open('a', buffering=1)  # line buffered: every operation is written at once
+        return dict(self.items), self.next_id
+
+    def append(self, op: Dict[str, Any]) -> None:
+        self.seq += 1
+        op['seq'] = self.seq
+        self._apply(op)
+        self._file.write(json.dumps(op, separators=(',', ':')) + '\n')
+        self.tail += 1
+        # a snapshot never costs more than the log it replaces
+        if self._compaction is None and self.tail >= max(self.compact_every, len(self.items)):
+            self._compaction = background_tasks.create(self.compact(), name='compact todo log')
+
+    async def compact(self) -> None:
+        """Write the current state as the new snapshot and start an empty log."""
+        items: List[List[Any]] = [[id_, name, done] for id_, (name, done) in self.items.items()]
+        snapshot = {'seq': self.seq, 'next_id': self.next_id, 'items': items}
+        self._file.close()
+        os.replace(self.log_path, self.old_log_path)
+        self._file = self.log_path.open('a', buffering=1)
+        self.tail = 0
+        try:
+            await run.io_bound(self._write_snapshot, snapshot)
+        finally:
+            self._compaction = None
+
+    def _write_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        temporary = self.snapshot_path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(snapshot, separators=(',', ':')))
+        os.replace(temporary, self.snapshot_path)
+        self.old_log_path.unlink()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _apply(self, op: Dict[str, Any]) -> None:
+        id_ = op['id']
+        if op['op'] == 'add':
+            self.items[id_] = (op['name'], op['done'])
+            self.next_id = max(self.next_id, id_ + 1)
+        elif op['op'] == 'remove':
+            self.items.pop(id_, None)
+        elif id_ in self.items:
+            name, done = self.items[id_]
+            self.items[id_] = (op.get('name', name), op.get('done', done))
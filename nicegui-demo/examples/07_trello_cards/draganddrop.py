@@ -1,29 +1,74 @@
 from __future__ import annotations
 
-from typing import Callable, Optional, Protocol
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
 
-from nicegui import ui
+from nicegui import app, background_tasks, events, helpers, ui
 
 
 class Item(Protocol):
     title: str
 
 
-dragged: Optional[card] = None
+class column(ui.column):
 
+    def __init__(self, name: str, on_drop: Optional[Callable[[Item, str], None]] = None, *,
+                 items: Optional[List[Item]] = None, page_size: int = 30) -> None:
+        """Column of draggable cards
 
-class column(ui.column):
+        Cards are either created inside the column (``with column(...): card(...)``)
+        or passed as `items`: then the column keeps them as plain data, creates cards for the first `page_size`
+        and creates the next page whenever the user scrolls near the bottom.
+        Dropped cards are appended, also to columns which have not created all of their cards yet.
 
-    def __init__(self, name: str, on_drop: Optional[Callable[[Item, str], None]] = None) -> None:
+        :param name: title of the column, passed to `on_drop`
+        :param on_drop: called with the item and the column name when a card is dropped
+        :param items: items to show with lazily created cards
+        :param page_size: number of cards created at once
+        """
         super().__init__()
         with self.classes('bg-blue-grey-2 w-60 p-4 rounded shadow-2'):
             ui.label(name).classes('text-bold ml-1')
+            self.items = None if items is None else list(items)
+            self.page_size = page_size
+            self.cards: List[card] = []  # the cards of items[:len(self.cards)]
+            if self.items is not None:
+                self.scroll_area = ui.scroll_area().classes('h-[70vh] -mx-2')
+                self.scroll_area.on('scroll', self.handle_scroll, ['verticalPercentage'], throttle=0.2)
+                with self.scroll_area:
+                    self.container = ui.column().classes('w-full px-2')
+                self.more = ui.label().classes('text-caption ml-1')
+                self.render_more()
         self.name = name
         self.on('dragover.prevent', self.highlight)
         self.on('dragleave', self.unhighlight)
         self.on('drop', self.move_card)
         self.on_drop = on_drop
 
+    def handle_scroll(self, e: events.GenericEventArguments) -> None:
+        if e.args['verticalPercentage'] > 0.8:
+            self.render_more()
+
+    def render_more(self) -> None:
+        """Create the cards of the next page of items."""
+        assert self.items is not None
+        with self.container:
+            for item in self.items[len(self.cards):len(self.cards) + self.page_size]:
+                self.cards.append(card(item))
+        self.update_more()
+
+    def update_more(self) -> None:
+        hidden = len(self.items) - len(self.cards)
+        self.more.set_text(f'{hidden} more cards')
+        self.more.set_visibility(hidden > 0)
+
+    def forget(self, dragged: card) -> None:
+        """Let go of a card that is dropped somewhere else."""
+        if self.items is not None:
+            self.items.remove(dragged.item)
+            self.cards.remove(dragged)
+            self.update_more()
+
     def highlight(self) -> None:
         self.classes(remove='bg-blue-grey-2', add='bg-blue-grey-3')
 
@@ -31,13 +76,25 @@ class column(ui.column):
         self.classes(remove='bg-blue-grey-3', add='bg-blue-grey-2')
 
     def move_card(self) -> None:
-        global dragged  # pylint: disable=global-statement # noqa: PLW0603
         self.unhighlight()
-        dragged.parent_slot.parent.remove(dragged)
-        with self:
-            card(dragged.item)
-        self.on_drop(dragged.item, self.name)
-        dragged = None
+        dragged: Optional[card] = app.storage.client.pop('dragged', None)
+        if dragged is None:  # not a card of this page
+            return
+        source = dragged.find_column()
+        if source is not None:
+            source.forget(dragged)
+        if self.items is None:
+            dragged.move(self)  # the browser only gets the new children of both columns, the card itself is kept
+        else:
+            self.items.append(dragged.item)
+            if len(self.cards) == len(self.items) - 1:
+                dragged.move(self.container)
+                self.cards.append(dragged)
+            else:
+                dragged.delete()  # its card is created again when the user scrolls to the end
+            self.update_more()
+        if self.on_drop is not None:
+            self.on_drop(dragged.item, self.name)
 
 
 class card(ui.card):
@@ -48,7 +105,43 @@ class card(ui.card):
         with self.props('draggable').classes('w-full cursor-pointer bg-grey-1'):
             ui.label(item.title)
         self.on('dragstart', self.handle_dragstart)
+        self.on('dragend', lambda: app.storage.client.pop('dragged', None))  # dropped outside of any column
 
     def handle_dragstart(self) -> None:
-        global dragged  # pylint: disable=global-statement # noqa: PLW0603
-        dragged = self
+        app.storage.client['dragged'] = self  # every client drags its own card
+
+    def find_column(self) -> Optional[column]:
+        element = self.parent_slot.parent if self.parent_slot else None
+        while element is not None and not isinstance(element, column):
+            element = element.parent_slot.parent if element.parent_slot else None
+        return element
+
+
+class DropBatch:
+    """Drops collected for `delay` seconds and handed to `persist` as one list of (item, column name) pairs.
+
+    If an item is moved several times within that time, only its last column is passed on.
+    """
+
+    def __init__(self, persist: Callable[[List[Tuple[Item, str]]], Any], *, delay: float = 1.0) -> None:
+        self.persist = persist
+        self.delay = delay
+        self.pending: Dict[int, Tuple[Item, str]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def add(self, item: Item, location: str) -> None:
+        self.pending.pop(id(item), None)  # keep the order of the last moves
+        self.pending[id(item)] = (item, location)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.delay, lambda: background_tasks.create(self.flush(), name='persist drops'))
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        moves, self.pending = list(self.pending.values()), {}
+        if moves:
+            result = self.persist(moves)
+            if helpers.is_coroutine_function(self.persist):
+                await result
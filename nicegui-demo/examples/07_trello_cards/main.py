@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
+import os
 from dataclasses import dataclass
+from typing import List, Tuple
 
 import draganddrop as dnd
 
@@ -9,22 +11,41 @@ from nicegui import ui
 @dataclass
 class ToDo:
     title: str
+    location: str
+
+
+todos = [
+    ToDo('Simplify Layouting', 'Next'),
+    ToDo('Provide Deployment', 'Next'),
+    ToDo('Improve Documentation', 'Doing'),
+    ToDo('Invent NiceGUI', 'Done'),
+    ToDo('Test in own Projects', 'Done'),
+    ToDo('Publish as Open Source', 'Done'),
+    ToDo('Release Native-Mode', 'Done'),
+]
+# TRELLO_CARDS=5000 adds generated cards, to try a large board
+todos += [ToDo(f'Task {i}', ['Next', 'Doing', 'Done'][i % 3]) for i in range(int(os.environ.get('TRELLO_CARDS', 0)))]
+
+
+def save(moves: List[Tuple[ToDo, str]]) -> None:
+    """Store a batch of drops; a real app would write them to its database in one transaction here."""
+    for todo, location in moves:
+        todo.location = location
+
+
+drops = dnd.DropBatch(save, delay=1.0)
 
 
 def handle_drop(todo: ToDo, location: str):
     ui.notify(f'"{todo.title}" is now in {location}')
+    drops.add(todo, location)
 
 
-with ui.row():
-    with dnd.column('Next', on_drop=handle_drop):
-        dnd.card(ToDo('Simplify Layouting'))
-        dnd.card(ToDo('Provide Deployment'))
-    with dnd.column('Doing', on_drop=handle_drop):
-        dnd.card(ToDo('Improve Documentation'))
-    with dnd.column('Done', on_drop=handle_drop):
-        dnd.card(ToDo('Invent NiceGUI'))
-        dnd.card(ToDo('Test in own Projects'))
-        dnd.card(ToDo('Publish as Open Source'))
-        dnd.card(ToDo('Release Native-Mode'))
+@ui.page('/')
+def index():
+    with ui.row():
+        for name in ['Next', 'Doing', 'Done']:
+            # only the cards in view are created; the others stay plain data until the user scrolls to them
+            dnd.column(name, on_drop=handle_drop, items=[todo for todo in todos if todo.location == name])
 
 ui.run()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""Many simulated browser sessions on a page of a demo or example: memory per client, event round trips and bytes sent.
+
+Run with `uv run load_test.py <script> [--path /] [--clients 50] [--step ...] [--rounds 5] [--pause 0.1]`.
+The script is started like in `startup_profile.py`. Every simulated client requests the page with its own cookies,
+connects to its websocket like the browser does (with the socket.io client that comes with NiceGUI)
+and runs the steps `--rounds` times, all clients at the same time. For the todo list this could be
+`--step "value@New item=Item {client}.{round}" --step "keydown.enter@New item" --step "value@q-checkbox[{round}]=true"`.
+
+A step is `<event>@<target>[=<value>]`:
+the event is a NiceGUI event like `click` or `keydown.enter`, or `value` to change the value of an input, checkbox etc.;
+the target is the text, the label, placeholder or value, or the tag of an element
+(optionally with `[i]` for the i-th match);
+the value is the new value for `value` (JSON, otherwise a string) and the event arguments for other events (JSON).
+`{client}` and `{round}` are replaced with the number of the client and the round.
+If a step navigates to another page, the client follows it like the browser does.
+
+The report shows the server's memory per connected client (Linux only, resident memory of the process group),
+the time from an event until the first message from the server arrives, or until the server has handled it
+if the page does not change (p50/p99; on pages that show the changes of other clients, their messages can arrive first)
+and the bytes of socket.io messages sent by the server per interaction, including the ones to other clients.
+Everything runs on localhost, no browser or internet connection is needed.
+"""
+import argparse
+import ast
+import asyncio
+import html
+import json
+import os
+import re
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import socketio
+
+from startup_profile import ensure_free, port_of, start, stop, wait_for_page
+
+ELEMENTS = re.compile(r'parseElements\(String\.raw`(.*?)`\)', re.DOTALL)
+QUERY = re.compile(r'^\s*query: (\{.*\}),$', re.MULTILINE)
+STEP = re.compile(r'^(?P<event>[^@]+)@(?P<target>[^=\[]+?)(?:\[(?P<index>[^\]]+)\])?(?:=(?P<value>.*))?$')
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def memory(pid: int) -> Optional[int]:
+    """Resident memory in bytes of all processes in the process group of `pid`; None without `/proc`."""
+    if not os.path.isdir('/proc'):
+        return None
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            stat = Path(f'/proc/{entry}/stat').read_text()
+            if int(stat.rsplit(')', 1)[1].split()[2]) == pid:  # the fields after the command name start with state
+                total += int(Path(f'/proc/{entry}/statm').read_text().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue  # the process has exited in the meantime
+    return total
+
+
+class SimulatedClient:
+
+    def __init__(self, number: int, base_url: str, *, timeout: float, settle: float) -> None:
+        """A browser tab that is controlled by steps
+
+        :param number: number of the client, used in the steps as `{client}`
+        :param base_url: URL of the server
+        :param timeout: seconds to wait for the server to handle an event
+        :param settle: seconds without messages after which an interaction counts as finished
+        """
+        self.number = number
+        self.base_url = base_url
+        self.timeout = timeout
+        self.settle = settle
+        self.http = httpx.AsyncClient(base_url=base_url, follow_redirects=True, timeout=timeout)
+        self.socket: Optional[socketio.AsyncClient] = None
+        self.tab_id = str(uuid.uuid4())
+        self.client_id = ''
+        self.next_message_id = 0
+        self.elements: Dict[str, Dict[str, Any]] = {}
+        self.received = 0  # bytes of socket.io messages
+        self.navigation: Optional[str] = None
+        self.last_message = 0.0
+        self.answer: Optional[float] = None  # time of the first message after the last event
+
+    async def open(self, path: str) -> int:
+        """Load the page and connect to it; returns the size of the page."""
+        response = await self.http.get(path)
+        response.raise_for_status()
+        elements, query = ELEMENTS.search(response.text), QUERY.search(response.text)
+        if elements is None or query is None:
+            raise RuntimeError(f'{response.url} is not a NiceGUI page')
+        self.elements = json.loads(html.unescape(elements.group(1)))
+        query_params = ast.literal_eval(query.group(1))  # rendered as Python dict
+        self.client_id = query_params['client_id']
+        self.next_message_id = query_params['next_message_id']
+        self.socket = socketio.AsyncClient(reconnection=False)
+        self.socket.on('*', self._handle_message)
+        await self.socket.connect(f'{self.base_url}?{httpx.QueryParams(query_params)}', transports=['websocket'],
+                                  socketio_path='/_nicegui_ws/socket.io', wait_timeout=self.timeout)
+        ok = await self.socket.call('handshake', {
+            'client_id': self.client_id,
+            'document_id': str(uuid.uuid4()),
+            'tab_id': self.tab_id,
+            'old_tab_id': None,
+            'next_message_id': self.next_message_id,
+        }, timeout=self.timeout)
+        if not ok:
+            raise RuntimeError(f'handshake for {response.url} failed')
+        return len(response.content)
+
+    async def close(self) -> None:
+        if self.socket is not None:
+            await self.socket.disconnect()
+        await self.http.aclose()
+
+    async def _handle_message(self, event: str, data: Any) -> None:
+        self.received += len(json.dumps([event, data], separators=(',', ':')))
+        self.last_message = time.perf_counter()
+        if self.answer is None:
+            self.answer = self.last_message
+        if isinstance(data, dict) and '_id' in data:
+            if data['_id'] < self.next_message_id:
+                return  # already received before a reconnect
+            self.next_message_id = data.pop('_id') + 1
+        if event == 'update':
+            for id_, element in data.items():
+                if element is None:
+                    self.elements.pop(id_, None)
+                else:
+                    self.elements[id_] = element
+        elif event == 'run_javascript' and data.get('request_id'):
+            assert self.socket is not None
+            await self.socket.emit('javascript_response',
+                                   {'request_id': data['request_id'], 'client_id': self.client_id, 'result': None})
+        elif event == 'open' and not data.get('new_tab'):
+            self.navigation = data['path']
+
+    def find(self, target: str, index: int) -> Tuple[str, Dict[str, Any]]:
+        """The `index`-th element with the target as text, tag or (string) prop, e.g. its label."""
+        matches = [
+            (id_, element) for id_, element in self.elements.items()
+            if target in {element.get('text'), element.get('tag')}
+            or target in (value for value in element.get('props', {}).values() if isinstance(value, str))
+        ]
+        if not matches:
+            raise LookupError(f'client {self.number} sees no element "{target}"')
+        return matches[index % len(matches)]
+
+    async def run(self, step: str, round_: int) -> Optional[float]:
+        """Run a step and wait until the server has answered; returns the round trip time, None without answer.
+
+        The answer is the first message after the event or, if the page does not change,
+        the acknowledgement of the server that it has handled the event.
+        """
+        match = STEP.match(step.format(client=self.number, round=round_))
+        if match is None:
+            raise ValueError(f'"{step}" is not a step like "click@Save" or "value@Name=Alice"')
+        id_, element = self.find(match['target'].strip(), int(match['index'] or 0))
+        words = match['event'].strip().split('.')
+        if words == ['value']:
+            types, keys = {'update:modelValue', 'update:value'}, set()
+            try:
+                args = json.loads(match['value'] or 'null')
+            except json.JSONDecodeError:
+                args = match['value']
+        else:
+            types, keys = {words[0]}, set(words[1:])
+            args = json.loads(match['value'] or '{}')
+        listeners = [
+            listener for listener in element.get('events', [])
+            if listener['type'] in types
+            and keys <= {*listener['keys'], *listener['modifiers'], *listener['specials']}
+        ]
+        if not listeners:
+            raise LookupError(f'"{match["target"]}" has no "{match["event"]}" listener')
+
+        assert self.socket is not None
+        self.answer = None
+        sent = time.perf_counter()
+        try:
+            for listener in listeners:
+                await self.socket.call('event', {'id': int(id_), 'client_id': self.client_id,
+                                                 'listener_id': listener['listener_id'], 'args': [json.dumps(args)]},
+                                       timeout=self.timeout)
+        except socketio.exceptions.TimeoutError:
+            return None
+        acknowledged = time.perf_counter()
+        while time.perf_counter() - max(self.last_message, acknowledged) < self.settle:
+            await asyncio.sleep(self.settle)
+        round_trip = (self.answer or acknowledged) - sent
+        await self.socket.emit('ack', {'client_id': self.client_id, 'next_message_id': self.next_message_id})
+        if self.navigation is not None:
+            path, self.navigation = self.navigation, None
+            await self.socket.disconnect()
+            await self.open(path)
+        return round_trip
+
+
+async def simulate(base_url: str, args: argparse.Namespace, pid: int) -> None:
+    interactions = len(args.step) * args.rounds
+
+    async def run_steps(client: SimulatedClient, round_trips: List[float]) -> None:
+        for round_ in range(args.rounds):
+            for step in args.step:
+                round_trip = await client.run(step, round_)
+                if round_trip is not None:
+                    round_trips.append(round_trip)
+                await asyncio.sleep(args.pause)
+
+    warm_up = SimulatedClient(-1, base_url, timeout=args.timeout, settle=args.settle)
+    clients = [SimulatedClient(number, base_url, timeout=args.timeout, settle=args.settle)
+               for number in range(args.clients)]
+    connect_times: List[float] = []
+
+    async def connect(client: SimulatedClient) -> int:
+        await asyncio.sleep(args.ramp * client.number / args.clients)
+        start_time = time.perf_counter()
+        size = await client.open(args.path)
+        connect_times.append(time.perf_counter() - start_time)
+        return size
+
+    try:
+        await warm_up.open(args.path)  # imports, caches and lazy routes of the page
+        await run_steps(warm_up, [])
+        await warm_up.close()
+        idle = memory(pid)
+        page_sizes = await asyncio.gather(*(connect(client) for client in clients))
+        received = sum(client.received for client in clients)
+        round_trips: List[float] = []
+        await asyncio.gather(*(run_steps(client, round_trips) for client in clients))
+        sent = sum(client.received for client in clients) - received
+        loaded = memory(pid)
+    finally:
+        await asyncio.gather(*(client.close() for client in [warm_up, *clients]), return_exceptions=True)
+
+    print(f'{args.script} {args.path}: {args.clients} clients, {len(args.step)} steps x {args.rounds} rounds')
+    print(f'connect:     p50 {statistics.median(connect_times) * 1000:.1f} ms, '
+          f'p99 {percentile(connect_times, 0.99) * 1000:.1f} ms, page {statistics.mean(page_sizes) / 1024:.0f} kB, '
+          f'{received / args.clients / 1024:.1f} kB of messages after connecting')
+    if idle is None or loaded is None:
+        print('memory:      n/a (needs /proc)')
+    else:
+        print(f'memory:      {(loaded - idle) / args.clients / 1024:.0f} kB per client '
+              f'(server {idle / 1024**2:.1f} -> {loaded / 1024**2:.1f} MB)')
+    if interactions:
+        missing = interactions * args.clients - len(round_trips)
+        if round_trips:
+            print(f'round trip:  p50 {statistics.median(round_trips) * 1000:.1f} ms, '
+                  f'p99 {percentile(round_trips, 0.99) * 1000:.1f} ms, '
+                  f'{missing} of {interactions * args.clients} events without answer')
+        print(f'sent:        {sent / (interactions * args.clients) / 1024:.2f} kB per interaction')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('script', type=Path, help='demo or example to start, e.g. examples/06_todo_list/main.py')
+    parser.add_argument('--path', default='/', help='page that the clients open')
+    parser.add_argument('--clients', type=int, default=50, help='number of simulated clients')
+    parser.add_argument('--step', action='append', default=[], help='interaction like "click@Save", can be repeated')
+    parser.add_argument('--rounds', type=int, default=5, help='how often every client runs the steps')
+    parser.add_argument('--pause', type=float, default=0.1, help='seconds between two steps of a client')
+    parser.add_argument('--ramp', type=float, default=1.0, help='seconds over which the clients connect')
+    parser.add_argument('--settle', type=float, default=0.05, help='seconds without messages that end an interaction')
+    parser.add_argument('--timeout', type=float, default=5.0, help='seconds to wait for an answer')
+    args = parser.parse_args()
+
+    base_url = f'http://127.0.0.1:{port_of(args.script)}'
+    ensure_free(base_url)
+    with tempfile.TemporaryDirectory() as cwd, open(Path(cwd) / 'stderr.log', 'w+') as log:
+        process = start(args.script.resolve(), cwd, log)
+        try:
+            if wait_for_page(base_url + args.path, process, 60.0) is None:
+                log.seek(0)
+                raise RuntimeError(f'{args.script} did not serve {args.path}:\n{log.read()[-2000:]}')
+            asyncio.run(simulate(base_url, args, process.pid))
+        finally:
+            stop(process)
+
+
+if __name__ == '__main__':
+    main()
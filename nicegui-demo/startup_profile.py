@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Startup time of the demos and examples: import time per module and time to the first served page.
+
+Run with `uv run startup_profile.py [scripts] [--save] [--tolerance 0.5] [--limit 5]`.
+Every script with a `ui.run` in `demos/` and `examples/*/main.py` (or only the given ones) is started like
+`uv run <script>` in a temporary working directory, with Python's `-X importtime` switched on,
+and its page is requested until it is served. The report lists the time to the first page,
+the time spent importing and the top-level modules that took longest.
+
+`--save` writes the times to `startup_baseline.json`; later runs compare against it and exit with status 1
+if a script got slower than the baseline by more than `--tolerance` (relative) or slower than `--limit` seconds.
+"""
+import argparse
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+ROOT = Path(__file__).parent
+BASELINE = ROOT / 'startup_baseline.json'
+HEAVY = ('numpy', 'pandas', 'openai', 'tortoise')  # shown if a script imports them before its first page
+IMPORT_TIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+UI_RUN = re.compile(r'^\s*ui\.run\(', re.MULTILINE)
+
+
+def discover() -> List[Path]:
+    demos = [path for path in sorted((ROOT / 'demos').glob('*.py')) if UI_RUN.search(path.read_text())]
+    return demos + sorted(ROOT.glob('examples/*/main.py'))
+
+
+def port_of(script: Path) -> int:
+    match = re.search(r'ui\.run\(.*\bport=(\d+)', script.read_text())
+    return int(match.group(1)) if match else 8080
+
+
+def parse_import_times(log: str) -> Tuple[Dict[str, float], Set[str]]:
+    """Cumulative import time in seconds of every top-level module and the names of all imported modules.
+
+    Scripts with `reload=True` are imported by the reloader and again by the server process,
+    so the maximum per module is kept instead of the sum.
+    """
+    times: Dict[str, float] = {}
+    modules: Set[str] = set()
+    for line in log.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            modules.add(match.group(4))
+            if not match.group(3):
+                times[match.group(4)] = max(times.get(match.group(4), 0.0), int(match.group(2)) / 1e6)
+    return times, modules
+
+
+def ensure_free(url: str) -> None:
+    with httpx.Client() as http:
+        try:
+            http.get(url, timeout=0.2)
+        except httpx.TransportError:
+            return
+    raise RuntimeError(f'{url} is already in use, stop the server that runs there first')
+
+
+def start(script: Path, cwd: str, log: IO[str], **env: str) -> subprocess.Popen:
+    """Start the script in its own process group; demos that need an API key get a dummy one."""
+    return subprocess.Popen([sys.executable, str(script)], cwd=cwd,
+                            env={**os.environ, 'api_key': os.environ.get('api_key', 'local'), **env},
+                            stdout=subprocess.DEVNULL, stderr=log, start_new_session=True)
+
+
+def wait_for_page(url: str, process: subprocess.Popen, timeout: float) -> Optional[httpx.Response]:
+    """Request the page until it is served; None if the process exits or the time is up first."""
+    start_time = time.perf_counter()
+    with httpx.Client(follow_redirects=True, timeout=timeout) as http:
+        while time.perf_counter() - start_time < timeout and process.poll() is None:
+            try:
+                return http.get(url)
+            except httpx.TransportError:
+                time.sleep(0.02)
+    return None
+
+
+def measure(script: Path, timeout: float) -> Tuple[Optional[float], Optional[int], str, str]:
+    """Time from the start of the process until the page is served, its status, the import log and other output."""
+    url = f'http://127.0.0.1:{port_of(script)}/'
+    ensure_free(url)
+    with tempfile.TemporaryDirectory() as cwd, open(Path(cwd) / 'stderr.log', 'w+') as log:
+        start_time = time.perf_counter()
+        process = start(script, cwd, log, PYTHONPROFILEIMPORTTIME='1')
+        try:
+            response = wait_for_page(url, process, timeout)
+            elapsed = time.perf_counter() - start_time
+        finally:
+            stop(process)
+        log.seek(0)
+        output = log.read()
+        errors = '\n'.join(line for line in output.splitlines() if not line.startswith('import time:'))
+        if response is None:
+            return None, None, output, errors
+        return elapsed, response.status_code, output, errors
+
+
+def stop(process: subprocess.Popen) -> None:
+    """Stop the process group, which includes the server process started by the reloader."""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass  # all processes have already exited
+        try:
+            process.wait(5)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scripts', nargs='*', type=Path, help='scripts to start (default: all demos and examples)')
+    parser.add_argument('--top', type=int, default=5, help='number of slowest imports to show per script')
+    parser.add_argument('--save', action='store_true', help=f'save the times as new baseline to {BASELINE.name}')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed relative slowdown against the baseline')
+    parser.add_argument('--limit', type=float, default=5.0, help='maximum time to the first page in seconds')
+    parser.add_argument('--timeout', type=float, default=60.0, help='seconds to wait for a page')
+    args = parser.parse_args()
+
+    baseline: Dict[str, float] = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    results: Dict[str, float] = {}
+    failures: List[str] = []
+    for script in [path.resolve() for path in args.scripts] or discover():
+        name = script.relative_to(ROOT.resolve()).as_posix()
+        elapsed, status, log, errors = measure(script, args.timeout)
+        if elapsed is None:
+            print(f'{name}: no page after {args.timeout:.0f} s', *errors.splitlines()[-5:], sep='\n    ')
+            failures.append(f'{name} did not serve a page')
+            continue
+        results[name] = elapsed
+        imports, modules = parse_import_times(log)
+        heavy = [module for module in HEAVY if module in modules]
+        print(f'{name}: first page after {elapsed:.2f} s (HTTP {status}), '
+              f'{sum(imports.values()):.2f} s of imports, heavy: {", ".join(heavy) or "-"}')
+        for module, seconds in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+            print(f'    {seconds * 1000:8.1f} ms  {module}')
+        if status >= 500:
+            failures.append(f'{name} answered with HTTP {status}')
+        if elapsed > args.limit:
+            failures.append(f'{name} took {elapsed:.2f} s, more than the limit of {args.limit:.2f} s')
+        if name in baseline and elapsed > baseline[name] * (1 + args.tolerance):
+            failures.append(f'{name} took {elapsed:.2f} s, {elapsed / baseline[name] - 1:.0%} more than the baseline '
+                            f'of {baseline[name]:.2f} s')
+
+    if args.save:
+        BASELINE.write_text(json.dumps({**baseline, **results}, indent=2, sort_keys=True) + '\n')
+        print(f'saved {len(results)} times to {BASELINE.name}')
+    elif failures:
+        print('\nstartup regressions:', *failures, sep='\n  ')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()